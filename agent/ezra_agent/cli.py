@@ -1,17 +1,16 @@
 """Command-line interface for Ezra agent."""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
+from string import Template
+from typing import TYPE_CHECKING
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
 
-from .companion_client import CompanionClient
-from .config import ConfigManager
-from .device import DeviceScanner
+if TYPE_CHECKING:
+    from rich.console import Console
 
 # Default options to avoid B008 errors
 _CONFIG_OPTION = typer.Option(
@@ -19,11 +18,35 @@ _CONFIG_OPTION = typer.Option(
 )
 
 app = typer.Typer(help="Ezra Control CLI - Manage your Ezra agent")
-console = Console()
+
+_SERVICE_TEMPLATE = Template("""[Unit]
+Description=Ezra Agent
+After=network.target
+
+[Service]
+Type=simple
+User=ezra
+WorkingDirectory=$workdir
+ExecStart=/usr/local/bin/ezra-agent start --daemon
+Restart=always
+RestartSec=5
+
+[Install]
+WantedBy=multi-user.target
+""")
+
+
+@cache
+def _console() -> "Console":
+    """Return the shared console, importing rich on first use."""
+    from rich.console import Console  # noqa: PLC0415
+
+    return Console()
 
 
 def _print_section(title: str) -> None:
     """Print a section header."""
+    console = _console()
     console.print("\n[bold]─" * 60 + "[/bold]")
     console.print(f"[bold cyan]{title}[/bold cyan]")
     console.print("[bold]─" * 60 + "[/bold]")
@@ -31,6 +54,11 @@ def _print_section(title: str) -> None:
 
 def _test_companion_connection(companion_url: str) -> bool:
     """Test connection to companion server. Returns True if successful."""
+    from rich.prompt import Confirm  # noqa: PLC0415
+
+    from .companion_client import CompanionClient  # noqa: PLC0415
+
+    console = _console()
     console.print(f"\n🔍 Testing connection to {companion_url}...")
 
     class TempConfig:
@@ -54,6 +82,9 @@ def _test_companion_connection(companion_url: str) -> bool:
 
 def _get_companion_config() -> str:
     """Prompt for companion server configuration."""
+    from rich.prompt import Prompt  # noqa: PLC0415
+
+    console = _console()
     _print_section("Companion Server Configuration")
     console.print("\nExamples:")
     console.print("  • Local development: http://localhost:3000")
@@ -64,6 +95,9 @@ def _get_companion_config() -> str:
 
 def _get_policy_config() -> str:
     """Prompt for policy verification configuration."""
+    from rich.prompt import Prompt  # noqa: PLC0415
+
+    console = _console()
     _print_section("Policy Verification")
     console.print("\nPath to the Ed25519 public key for verifying action plans.")
     console.print("This should match the private key used by the companion server.\n")
@@ -72,13 +106,17 @@ def _get_policy_config() -> str:
 
 def _get_enrollment_config() -> str:
     """Prompt for device enrollment configuration."""
+    from rich.prompt import Prompt  # noqa: PLC0415
+
     _print_section("Device Enrollment (Optional)")
-    console.print("\nLeave empty if not using enrollment tokens.\n")
+    _console().print("\nLeave empty if not using enrollment tokens.\n")
     return Prompt.ask("Enrollment token", default="")
 
 
 def _get_additional_config() -> dict:
     """Prompt for additional configuration options."""
+    from rich.prompt import Prompt  # noqa: PLC0415
+
     _print_section("Additional Configuration")
     return {
         "device_id": Prompt.ask("\nDevice ID", default="ezra_device_001"),
@@ -151,6 +189,7 @@ MAX_RETRIES=3
 
 def _print_next_steps(policy_pub_key_path: str) -> None:
     """Print next steps after setup completion."""
+    console = _console()
     _print_section("Next Steps")
     console.print("\n1. Ensure you have the public key file:")
     console.print(f"   {policy_pub_key_path}")
@@ -167,6 +206,10 @@ def _print_next_steps(policy_pub_key_path: str) -> None:
 @app.command()
 def setup():
     """Interactive setup wizard for Ezra agent."""
+    from rich.panel import Panel  # noqa: PLC0415
+    from rich.prompt import Confirm  # noqa: PLC0415
+
+    console = _console()
     console.print(Panel.fit(
         "[bold cyan]Ezra Device Agent - Setup Wizard[/bold cyan]",
         border_style="cyan",
@@ -237,6 +280,9 @@ def init(
     config_file: Path | None = _CONFIG_OPTION,
 ):
     """Initialize agent configuration."""
+    from .config import ConfigManager  # noqa: PLC0415
+
+    console = _console()
     config_manager = ConfigManager(config_file)
 
     # Create default config
@@ -260,6 +306,10 @@ def config(
     config_file: Path | None = _CONFIG_OPTION,
 ):
     """Show current configuration."""
+    from rich.table import Table  # noqa: PLC0415
+
+    from .config import ConfigManager  # noqa: PLC0415
+
     config_manager = ConfigManager(config_file)
     config = config_manager.load()
 
@@ -277,7 +327,7 @@ def config(
     table.add_row("Cache Directory", str(config.cache_dir))
     table.add_row("Backup Directory", str(config.backup_dir))
 
-    console.print(table)
+    _console().print(table)
 
 
 @app.command()
@@ -285,36 +335,51 @@ def scan(
     config_file: Path | None = _CONFIG_OPTION,
 ):
     """Scan device information."""
+    from rich.console import Group  # noqa: PLC0415
+    from rich.live import Live  # noqa: PLC0415
+    from rich.panel import Panel  # noqa: PLC0415
+    from rich.table import Table  # noqa: PLC0415
+
+    from .config import ConfigManager  # noqa: PLC0415
+    from .device import DeviceScanner  # noqa: PLC0415
+
+    console = _console()
     config_manager = ConfigManager(config_file)
     config = config_manager.load()
 
     scanner = DeviceScanner()
-    device_info = scanner.scan(config.device_id)
-
-    # Display device information
-    console.print(Panel.fit("[bold]Device Information[/bold]\n", style="blue"))
+    identity = scanner.scan_identity()
 
     table = Table(title="Device Details")
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="green")
 
-    table.add_row("ID", device_info.id)
-    table.add_row("Platform", device_info.platform)
-    table.add_row("OS", f"{device_info.os} {device_info.version}")
-    table.add_row("Architecture", device_info.architecture)
-    table.add_row("CPU", device_info.hardware.cpu)
-    table.add_row("Memory", f"{device_info.hardware.memory // (1024**3)} GB")
-    table.add_row("Storage", f"{device_info.hardware.storage // (1024**3)} GB")
-    if device_info.hardware.gpu:
-        table.add_row("GPU", device_info.hardware.gpu)
+    table.add_row("ID", config.device_id)
+    table.add_row("Platform", identity["platform"])
+    table.add_row("OS", f"{identity['os']} {identity['version']}")
+    table.add_row("Architecture", identity["architecture"])
 
-    console.print(table)
+    capabilities = Table.grid()
+    capabilities.add_column()
 
-    # Display capabilities
-    if device_info.capabilities:
-        console.print("\n[bold]Capabilities:[/bold]")
-        for capability in device_info.capabilities:
-            console.print(f"  • {capability}")
+    # Render identity rows now and fill in the slower probes as they finish
+    view = Group(
+        Panel.fit("[bold]Device Information[/bold]\n", style="blue"),
+        table,
+        "\n[bold]Capabilities:[/bold]",
+        capabilities,
+    )
+    with Live(view, console=console), ThreadPoolExecutor(max_workers=1) as pool:
+        hardware_future = pool.submit(scanner.scan_hardware)
+        for capability in scanner.scan_capabilities():
+            capabilities.add_row(f"  • {capability}")
+
+        hardware = hardware_future.result()
+        table.add_row("CPU", hardware.cpu)
+        table.add_row("Memory", f"{hardware.memory // (1024**3)} GB")
+        table.add_row("Storage", f"{hardware.storage // (1024**3)} GB")
+        if hardware.gpu:
+            table.add_row("GPU", hardware.gpu)
 
 
 @app.command()
@@ -322,6 +387,13 @@ def test(
     config_file: Path | None = None,
 ):
     """Test connection to companion server."""
+    from rich.console import Group  # noqa: PLC0415
+    from rich.table import Table  # noqa: PLC0415
+
+    from .companion_client import CompanionClient  # noqa: PLC0415
+    from .config import ConfigManager  # noqa: PLC0415
+
+    console = _console()
     config_manager = ConfigManager(config_file)
     config = config_manager.load()
 
@@ -329,25 +401,39 @@ def test(
 
     console.print("🔍 Testing companion server connection...")
 
+    # The probes are independent, so issue them together over the pooled session
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        healthy = pool.submit(client.health_check)
+        providers_future = pool.submit(client.get_providers_status)
+        public_key_future = pool.submit(client.get_public_key)
+
     # Health check
-    if client.health_check():
+    if healthy.result():
         console.print("✅ Companion server is healthy")
     else:
         console.print("❌ Companion server is not available")
         return
 
+    # Collect the remaining output and render it in one pass
+    sections = []
+
     # Get providers status
-    providers = client.get_providers_status()
+    providers = providers_future.result()
     if providers:
-        console.print("\n📡 LLM Providers:")
+        table = Table(title="📡 LLM Providers")
+        table.add_column("Provider", style="cyan")
+        table.add_column("Status")
         for provider in providers.get("providers", []):
             status = "✅" if provider.get("available") else "❌"
-            console.print(f"  {status} {provider.get('name')}")
+            table.add_row(provider.get("name"), status)
+        sections.append(table)
 
     # Get public key
-    public_key = client.get_public_key()
+    public_key = public_key_future.result()
     if public_key:
-        console.print(f"\n🔑 Public Key: {public_key[:32]}...")
+        sections.append(f"\n🔑 Public Key: {public_key[:32]}...")
+
+    console.print(Group(*sections))
 
 
 @app.command()
@@ -355,6 +441,7 @@ def install(
     service: bool = typer.Option(False, "--service", help="Install as system service"),
 ):
     """Install agent as system service."""
+    console = _console()
     if not service:
         console.print("Use --service flag to install as system service")
         return
@@ -364,21 +451,9 @@ def install(
 
     if sys.platform == "linux":
         # Create systemd service file
-        service_content = f"""[Unit]
-Description=Ezra Agent
-After=network.target
-
-[Service]
-Type=simple
-User=ezra
-WorkingDirectory={Path.home() / '.ezra'}
-ExecStart=/usr/local/bin/ezra-agent start --daemon
-Restart=always
-RestartSec=5
-
-[Install]
-WantedBy=multi-user.target
-"""
+        service_content = _SERVICE_TEMPLATE.substitute(
+            workdir=Path.home() / ".ezra",
+        )
 
         service_file = Path("/etc/systemd/system/ezra-agent.service")
         console.print(f"📝 Creating service file: {service_file}")
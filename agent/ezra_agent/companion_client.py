@@ -1,10 +1,13 @@
 """Companion server client for communication."""
 
+import atexit
 from typing import Any
 
 import requests
 from loguru import logger
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import AgentConfig
 from .device import DeviceInfo
@@ -37,6 +40,21 @@ class CompanionClient:
         self.session = requests.Session()
         self.session.timeout = config.timeout / 1000  # Convert to seconds
 
+        # Reuse pooled keep-alive connections and retry transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=config.max_retries,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"]),
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        atexit.register(self.session.close)
+
         # Set up session headers
         self.session.headers.update({
             "Content-Type": "application/json",
@@ -58,14 +76,16 @@ class CompanionClient:
         """Generate action plan from companion server."""
         try:
             url = f"{self.base_url}/api/v1/agent/plan"
-            data = request.dict()
+            # Serialize straight to JSON bytes; the session sets Content-Type.
+            # Unset optional fields are omitted, as the companion schema expects.
+            data = request.model_dump_json(exclude_none=True).encode()
 
             logger.info(f"Sending request to companion server: {url}")
-            response = self.session.post(url, json=data)
+            response = self.session.post(url, data=data)
             response.raise_for_status()
 
-            response_data = response.json()
-            return AgentResponse(**response_data)
+            # Decode and validate the body in one pass, without an interim dict
+            return AgentResponse.model_validate_json(response.content)
 
         except requests.RequestException as e:
             logger.error(f"Failed to generate action plan: {e}")
@@ -4,12 +4,35 @@ import hashlib
 import json
 import os
 import platform
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 
+@lru_cache(maxsize=1)
+def _system_fingerprint() -> str:
+    """Build a stable device ID from system information.
+
+    ``platform.processor()`` may spawn a subprocess, so this is computed
+    once per process.
+    """
+    # Create a unique identifier based on system information
+    system_info = {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "hostname": platform.node(),
+    }
+
+    # Hash the system info to create a stable device ID
+    info_str = json.dumps(system_info, sort_keys=True)
+    device_id = hashlib.blake2b(info_str.encode(), digest_size=8).hexdigest()
+
+    return f"ezra_{device_id}"
+
+
 class AgentConfig(BaseModel):
     """Agent configuration model."""
 
@@ -30,6 +53,12 @@ class AgentConfig(BaseModel):
     )
 
 
+@lru_cache(maxsize=4)
+def _load_cached(path_str: str, _mtime_ns: int) -> AgentConfig:
+    """Parse a config file, cached per (path, mtime) so edits invalidate it."""
+    return AgentConfig.model_validate_json(Path(path_str).read_bytes())
+
+
 class ConfigManager:
     """Manages agent configuration."""
 
@@ -61,13 +90,14 @@ class ConfigManager:
             return self._config
 
         if self.config_path.exists():
+            # Reuse the parsed config while the file is unchanged on disk
+            mtime_ns = self.config_path.stat().st_mtime_ns
             try:
-                with self.config_path.open(encoding="utf-8") as f:
-                    config_data = json.load(f)
-                self._config = AgentConfig(**config_data)
-            except (json.JSONDecodeError, ValueError) as e:
+                cached = _load_cached(str(self.config_path), mtime_ns)
+            except ValueError as e:
                 msg = f"Invalid configuration file: {e}"
                 raise ValueError(msg) from e
+            self._config = cached.model_copy()
         else:
             # Create default configuration
             self._config = self.create_default_config()
@@ -84,8 +114,9 @@ class ConfigManager:
         # Ensure directory exists
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with self.config_path.open("w", encoding="utf-8") as f:
-            json.dump(self._config.dict(), f, indent=2, default=str)
+        self.config_path.write_text(
+            self._config.model_dump_json(indent=2), encoding="utf-8",
+        )
 
     def create_default_config(self) -> AgentConfig:
         """Create default configuration."""
@@ -96,19 +127,7 @@ class ConfigManager:
 
     def _generate_device_id(self) -> str:
         """Generate unique device ID."""
-        # Create a unique identifier based on system information
-        system_info = {
-            "platform": platform.platform(),
-            "machine": platform.machine(),
-            "processor": platform.processor(),
-            "hostname": platform.node(),
-        }
-
-        # Hash the system info to create a stable device ID
-        info_str = json.dumps(system_info, sort_keys=True)
-        device_id = hashlib.sha256(info_str.encode()).hexdigest()[:16]
-
-        return f"ezra_{device_id}"
+        return _system_fingerprint()
 
     def update(self, **kwargs: Any) -> None:
         """Update configuration values."""
@@ -1,13 +1,187 @@
 """Device information collection and management."""
 
 import platform
+import re
+import shutil
 import subprocess
-from datetime import UTC, datetime
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from functools import cache, lru_cache
+from pathlib import Path
 from typing import Any
 
 import psutil
 from pydantic import BaseModel, Field
 
+_IS_WINDOWS = platform.system() == "Windows"
+_STORAGE_PATH = "C:\\" if _IS_WINDOWS else "/"
+
+
+@lru_cache(maxsize=1)
+def _detect_platform() -> str:
+    """Detect the platform type."""
+    system = platform.system().lower()
+
+    if system == "linux":
+        return "linux"
+    if system == "windows":
+        return "windows"
+    if system == "darwin":
+        return "macos"  # Treat macOS as a variant of Unix
+    if "android" in platform.platform().lower():
+        return "android"
+    return "console"  # Fallback for other systems
+
+
+@lru_cache(maxsize=1)
+def _cpu_info() -> str:
+    """Get the CPU description, probed once per process."""
+    cpu_info = platform.processor()
+    if not cpu_info or cpu_info == "unknown":
+        cpu_info = platform.machine()
+    return cpu_info
+
+
+_DISK_POLL_SECONDS = 5
+_CPU_SAMPLE_WINDOW = 12
+
+# Device name from an lspci display-class line, without the "(rev xx)" suffix
+_GPU_RE = re.compile(
+    r"(?:VGA compatible|3D|Display) controller[^:]*:\s*(.+?)(?:\s*\(rev [^)]*\))?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_NVIDIA_VENDOR_ID = "0x10de"
+_GPU_PROBE_TIMEOUT = 2
+
+_BASE_CAPABILITIES = ("file_system", "network", "process_management")
+
+_PLATFORM_CAPABILITIES = {
+    "linux": ("package_management", "systemd", "shell_access", "root_access"),
+    "windows": ("powershell", "registry_access", "windows_services"),
+}
+
+# (platform scope, command to look for, capability it provides)
+_CAPABILITY_PROBES: tuple[tuple[str, str, str], ...] = (
+    ("linux", "apt", "apt_package_manager"),
+    ("linux", "yum", "yum_package_manager"),
+    ("linux", "dnf", "dnf_package_manager"),
+    ("linux", "pacman", "pacman_package_manager"),
+    ("windows", "choco", "chocolatey_package_manager"),
+    ("windows", "winget", "winget_package_manager"),
+    ("any", "git", "git"),
+    ("any", "docker", "docker"),
+    ("any", "python", "python"),
+    ("any", "node", "nodejs"),
+    ("any", "kvm", "kvm_virtualization"),
+    ("any", "virtualbox", "virtualbox"),
+)
+
+_MEMINFO = Path("/proc/meminfo")
+_LOADAVG = Path("/proc/loadavg")
+
+
+@lru_cache(maxsize=1)
+def _disk_usage(root: str, _bucket: int) -> Any:
+    """Get disk usage, refreshed at most once per polling bucket."""
+    return psutil.disk_usage(root)
+
+
+@lru_cache(maxsize=1)
+def _memory_total() -> int:
+    """Get total memory in bytes, read from /proc/meminfo where available."""
+    try:
+        with _MEMINFO.open() as meminfo:
+            for line in meminfo:
+                if line.startswith("MemTotal:"):
+                    # Reported in kB
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return psutil.virtual_memory().total
+
+
+@lru_cache(maxsize=1)
+def _storage_total(root: str) -> int:
+    """Get total storage of the root volume in bytes."""
+    return psutil.disk_usage(root).total
+
+
+def _load_average() -> tuple[float, float, float] | None:
+    """Get the 1, 5 and 15 minute load averages."""
+    try:
+        one, five, fifteen = _LOADAVG.read_text().split()[:3]
+        return float(one), float(five), float(fifteen)
+    except (OSError, ValueError):
+        pass
+    return psutil.getloadavg() if hasattr(psutil, "getloadavg") else None
+
+
+def _sysfs_gpu_vendors() -> frozenset[str] | None:
+    """Get PCI vendor IDs of display controllers, or None without sysfs."""
+    devices = Path("/sys/bus/pci/devices")
+    if not devices.is_dir():
+        return None
+
+    vendors = set()
+    for device in devices.iterdir():
+        try:
+            # PCI class 0x03xxxx is a display controller
+            if (device / "class").read_text().startswith("0x03"):
+                vendors.add((device / "vendor").read_text().strip())
+        except OSError:
+            continue
+    return frozenset(vendors)
+
+
+@lru_cache(maxsize=1)
+def _detect_gpu() -> str | None:
+    """Detect GPU information, probed once per process."""
+    vendors = _sysfs_gpu_vendors()
+
+    # Only spawn the probes that can find something on this hardware
+    if vendors is not None and _NVIDIA_VENDOR_ID not in vendors:
+        return _detect_lspci_gpu() if vendors else None
+
+    # Run both probes side by side, NVIDIA results take precedence
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        nvidia_future = pool.submit(_detect_nvidia_gpu)
+        lspci_future = pool.submit(_detect_lspci_gpu)
+    return nvidia_future.result() or lspci_future.result()
+
+
+def _detect_nvidia_gpu() -> str | None:
+    """Detect an NVIDIA GPU via nvidia-smi."""
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
+            check=False, capture_output=True, text=True, timeout=_GPU_PROBE_TIMEOUT,
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        pass
+    return None
+
+
+def _detect_lspci_gpu() -> str | None:
+    """Detect a GPU of any vendor via lspci."""
+    try:
+        result = subprocess.run(
+            ["lspci"],
+            check=False, capture_output=True, text=True, timeout=_GPU_PROBE_TIMEOUT,
+        )
+        if result.returncode == 0:
+            match = _GPU_RE.search(result.stdout)
+            if match:
+                return match.group(1)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        pass
+    return None
+
 
 class HardwareInfo(BaseModel):
     """Hardware information model."""
@@ -39,64 +213,63 @@ class DeviceScanner:
     def __init__(self):
         """Initialize device scanner."""
         self._capabilities: list[str] = []
+        # Device facts don't change while the process runs
+        self._scans: dict[str, DeviceInfo] = {}
+        # Boot time is fixed for the life of the process
+        self._boot_time = psutil.boot_time()
+        self._boot_iso = datetime.fromtimestamp(self._boot_time, tz=UTC).isoformat()
+        # Seed the CPU counters so later non-blocking samples have a baseline
+        psutil.cpu_percent(interval=None)
+        self._cpu_samples: deque[float] = deque(maxlen=_CPU_SAMPLE_WINDOW)
 
     def scan(self, device_id: str) -> DeviceInfo:
-        """Scan device and return information."""
-        # Detect platform
-        platform_name = self._detect_platform()
-
-        # Get system information
-        arch = platform.machine()
-        os_name = platform.system()
-        os_version = platform.release()
+        """Scan device and return information, reusing earlier scans."""
+        cached = self._scans.get(device_id)
+        if cached is not None:
+            return cached
 
-        # Get hardware information
-        hardware = self._get_hardware_info()
+        identity = self.scan_identity()
 
-        # Detect capabilities
-        capabilities = self._detect_capabilities()
+        # Hardware (including GPU) and capability probes are independent
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            hardware_future = pool.submit(self.scan_hardware)
+            capabilities_future = pool.submit(self._detect_capabilities)
+        hardware = hardware_future.result()
+        capabilities = capabilities_future.result()
 
-        return DeviceInfo(
+        device_info = DeviceInfo(
             id=device_id,
-            platform=platform_name,
-            architecture=arch,
-            os=os_name,
-            version=os_version,
+            **identity,
             hardware=hardware,
             capabilities=capabilities,
             timestamp=datetime.now(UTC).isoformat(),
         )
+        self._scans[device_id] = device_info
+        return device_info
+
+    def scan_identity(self) -> dict[str, str]:
+        """Get platform, architecture and OS fields without probing hardware."""
+        return {
+            "platform": self._detect_platform(),
+            "architecture": platform.machine(),
+            "os": platform.system(),
+            "version": platform.release(),
+        }
 
     def _detect_platform(self) -> str:
         """Detect the platform type."""
-        system = platform.system().lower()
-
-        if system == "linux":
-            return "linux"
-        if system == "windows":
-            return "windows"
-        if system == "darwin":
-            return "macos"  # Treat macOS as a variant of Unix
-        if "android" in platform.platform().lower():
-            return "android"
-        return "console"  # Fallback for other systems
-
-    def _get_hardware_info(self) -> HardwareInfo:
+        return _detect_platform()
+
+    def scan_hardware(self) -> HardwareInfo:
         """Get hardware information."""
         # CPU information
-        cpu_info = platform.processor()
-        if not cpu_info or cpu_info == "unknown":
-            cpu_info = platform.machine()
+        cpu_info = _cpu_info()
 
         # Memory information
-        memory = psutil.virtual_memory()
-        total_memory = memory.total
+        total_memory = _memory_total()
 
         # Storage information
-        storage = psutil.disk_usage("/")
-        if platform.system() == "Windows":
-            storage = psutil.disk_usage("C:\\")
-        total_storage = storage.total
+        total_storage = _storage_total(_STORAGE_PATH)
 
         # GPU information (basic detection)
         gpu_info = self._detect_gpu()
@@ -110,157 +283,47 @@ class DeviceScanner:
 
     def _detect_gpu(self) -> str | None:
         """Detect GPU information."""
-        try:
-            # Try to detect NVIDIA GPU
-            result = subprocess.run(
-                ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
-                check=False, capture_output=True, text=True, timeout=5,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return result.stdout.strip()
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-
-        # Try to detect AMD GPU
-        try:
-            result = subprocess.run(
-                ["lspci"], check=False, capture_output=True, text=True, timeout=5,
-            )
-            if result.returncode == 0:
-                lines = result.stdout.split("\n")
-                for line in lines:
-                    if ("vga" in line.lower() and
-                        ("amd" in line.lower() or "radeon" in line.lower())):
-                        return line.strip()
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-
-        return None
+        return _detect_gpu()
 
     def _detect_capabilities(self) -> list[str]:
         """Detect device capabilities."""
-        capabilities = []
-
-        # Basic capabilities
-        capabilities.extend(["file_system", "network", "process_management"])
-
-        # Platform-specific capabilities
-        system = platform.system().lower()
-        if system == "linux":
-            capabilities.extend(self._get_linux_capabilities())
-        elif system == "windows":
-            capabilities.extend(self._get_windows_capabilities())
-
-        # Development and virtualization tools
-        capabilities.extend(self._get_development_capabilities())
-        capabilities.extend(self._get_virtualization_capabilities())
-
-        return capabilities
-
-    def _get_linux_capabilities(self) -> list[str]:
-        """Get Linux-specific capabilities."""
-        capabilities = [
-            "package_management",
-            "systemd",
-            "shell_access",
-            "root_access",
-        ]
-
-        # Check for specific package managers
-        package_managers = {
-            "apt": "apt_package_manager",
-            "yum": "yum_package_manager",
-            "dnf": "dnf_package_manager",
-            "pacman": "pacman_package_manager",
-        }
-
-        for cmd, capability in package_managers.items():
-            if self._has_command(cmd):
-                capabilities.append(capability)
-
-        return capabilities
-
-    def _get_windows_capabilities(self) -> list[str]:
-        """Get Windows-specific capabilities."""
-        capabilities = [
-            "powershell",
-            "registry_access",
-            "windows_services",
-        ]
-
-        # Check for specific package managers
-        package_managers = {
-            "choco": "chocolatey_package_manager",
-            "winget": "winget_package_manager",
-        }
-
-        for cmd, capability in package_managers.items():
-            if self._has_command(cmd):
-                capabilities.append(capability)
-
-        return capabilities
-
-    def _get_development_capabilities(self) -> list[str]:
-        """Get development tool capabilities."""
-        capabilities = []
-
-        dev_tools = {
-            "git": "git",
-            "docker": "docker",
-            "python": "python",
-            "node": "nodejs",
-        }
-
-        for cmd, capability in dev_tools.items():
-            if self._has_command(cmd):
-                capabilities.append(capability)
-
-        return capabilities
-
-    def _get_virtualization_capabilities(self) -> list[str]:
-        """Get virtualization capabilities."""
-        capabilities = []
-
-        virt_tools = {
-            "kvm": "kvm_virtualization",
-            "virtualbox": "virtualbox",
-        }
-
-        for cmd, capability in virt_tools.items():
-            if self._has_command(cmd):
-                capabilities.append(capability)
-
-        return capabilities
+        return list(self.scan_capabilities())
+
+    def scan_capabilities(self) -> Iterator[str]:
+        """Yield device capabilities as each group of probes completes."""
+        system = _detect_platform()
+        yield from _BASE_CAPABILITIES
+        yield from _PLATFORM_CAPABILITIES.get(system, ())
+
+        # Package managers, development and virtualization tools
+        yield from (
+            capability
+            for scope, cmd, capability in _CAPABILITY_PROBES
+            if scope in ("any", system) and self._has_command(cmd)
+        )
 
-    def _has_command(self, command: str) -> bool:
+    @staticmethod
+    @cache
+    def _has_command(command: str) -> bool:
         """Check if a command is available."""
-        try:
-            result = subprocess.run(
-                ["which", command], check=False, capture_output=True, timeout=2,
-            )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
-        else:
-            return result.returncode == 0
+        return shutil.which(command) is not None
 
     def get_system_status(self) -> dict[str, Any]:
         """Get current system status."""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        self._cpu_samples.append(cpu_percent)
         return {
-            "cpu_percent": psutil.cpu_percent(interval=1),
+            "cpu_percent": cpu_percent,
+            "cpu_percent_avg": sum(self._cpu_samples) / len(self._cpu_samples),
             "memory_percent": psutil.virtual_memory().percent,
-            "disk_percent": (
-                psutil.disk_usage("/").percent
-                if platform.system() != "Windows"
-                else psutil.disk_usage("C:\\").percent
-            ),
-            "load_average": (
-                psutil.getloadavg() if hasattr(psutil, "getloadavg") else None
-            ),
-            "boot_time": datetime.fromtimestamp(
-                psutil.boot_time(), tz=UTC,
-            ).isoformat(),
-            "uptime": (
-                datetime.now(UTC) -
-                datetime.fromtimestamp(psutil.boot_time(), tz=UTC)
-            ),
+            "disk_percent": _disk_usage(
+                _STORAGE_PATH, int(time.monotonic() // _DISK_POLL_SECONDS),
+            ).percent,
+            "load_average": _load_average(),
+            "boot_time": self._boot_iso,
+            "uptime": timedelta(seconds=time.time() - self._boot_time),
         }
+
+    def sample_cpu(self, window: float) -> float:
+        """Measure CPU utilisation over a blocking window in seconds."""
+        return psutil.cpu_percent(interval=window)
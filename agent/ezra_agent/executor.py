@@ -1,10 +1,18 @@
 """Action plan executor with system adapters."""
 
+import contextlib
 import json
+import os
 import platform
 import shlex
+import signal
 import subprocess
+import threading
 import time
+from collections import deque
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
 from typing import Any
 
 import psutil
@@ -13,6 +21,72 @@ from pydantic import BaseModel, Field
 
 from .config import AgentConfig
 
+_IS_WINDOWS = platform.system() == "Windows"
+_STORAGE_PATH = "C:\\" if _IS_WINDOWS else "/"
+
+# Lines of command output retained per command
+_OUTPUT_TAIL_LINES = 10000
+_COMMAND_TIMEOUT = 300  # 5 minutes
+# After a timeout kill, how long to wait for output a surviving process may
+# still hold open (only possible on Windows, where the group isn't killed)
+_READER_GRACE_SECONDS = 5
+
+
+def _utcnow_iso() -> str:
+    """Get the current UTC time as an ISO 8601 string."""
+    return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _drain_output(
+    process: subprocess.Popen, sink: deque[str], errors: list[Exception],
+) -> None:
+    """Read a process's output into sink, killing it if reading fails."""
+    try:
+        sink.extend(process.stdout)
+    except (OSError, ValueError) as e:
+        # Nothing else drains the pipe, so stop the process from blocking on it
+        errors.append(e)
+        process.kill()
+
+
+def _kill_process_tree(process: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session, and everything it started.
+
+    On Windows only the process itself is killed.
+    """
+    if _IS_WINDOWS:
+        process.kill()
+        return
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def _builtin_echo(args: list[str]) -> str | None:
+    """Run ``echo`` without options in-process."""
+    if args and args[0].startswith("-"):
+        return None
+    return " ".join(args) + "\n"
+
+
+def _builtin_mkdir(args: list[str]) -> str | None:
+    """Run ``mkdir [-p]`` in-process."""
+    parents = args[:1] == ["-p"]
+    paths = args[1:] if parents else args
+    if not paths or any(path.startswith("-") for path in paths):
+        return None
+
+    for path in paths:
+        Path(path).mkdir(parents=parents, exist_ok=parents)
+    return ""
+
+
+# Commands simple enough to run without spawning a process. A handler returns
+# None when it doesn't support the given arguments, deferring to the real tool.
+_BUILTIN_HANDLERS: dict[str, Callable[[list[str]], str | None]] = {
+    "echo": _builtin_echo,
+    "mkdir": _builtin_mkdir,
+}
+
 
 class CommandExecutionError(Exception):
     """Custom exception for command execution errors."""
@@ -67,7 +141,7 @@ class ActionExecutor:
                     status="failed",
                     error=str(e),
                     duration=0.0,
-                    timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    timestamp=_utcnow_iso(),
                 ))
 
         return results
@@ -103,7 +177,7 @@ class ActionExecutor:
                 status="completed",
                 output=output,
                 duration=duration,
-                timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                timestamp=_utcnow_iso(),
             )
 
         except (CommandExecutionError, ValueError, RuntimeError) as e:
@@ -119,29 +193,55 @@ class ActionExecutor:
                 status="failed",
                 error=str(e),
                 duration=duration,
-                timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                timestamp=_utcnow_iso(),
             )
 
     def _execute_command(self, command: str) -> str:
-        """Execute a single command."""
+        """Execute a single command, keeping only the tail of its output."""
         try:
             # Parse command into list for security
             cmd_list = shlex.split(command) if isinstance(command, str) else command
 
-            result = subprocess.run(
+            output = self._run_builtin(cmd_list, command)
+            if output is not None:
+                return output
+
+            # Stream merged stdout/stderr into a bounded buffer so large
+            # outputs (e.g. package upgrades) don't accumulate in memory
+            output_tail: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+            read_errors: list[Exception] = []
+            with subprocess.Popen(
                 cmd_list,
-                check=False,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=300,  # 5 minute timeout
-            )
-
-            output = result.stdout
-            if result.stderr:
-                output += f"\nSTDERR: {result.stderr}"
-
-            if result.returncode != 0:
-                self._raise_command_error(result.returncode, command, output)
+                errors="replace",
+                bufsize=1,
+                # Own process group, so a timeout also kills its children
+                start_new_session=True,
+            ) as process:
+                reader = threading.Thread(
+                    target=_drain_output,
+                    args=(process, output_tail, read_errors),
+                    daemon=True,
+                )
+                reader.start()
+                try:
+                    returncode = process.wait(timeout=_COMMAND_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    _kill_process_tree(process)
+                    reader.join(_READER_GRACE_SECONDS)
+                    raise
+                reader.join()
+
+            if read_errors:
+                msg = f"Failed to read output of command: {command}"
+                raise CommandExecutionError(msg) from read_errors[0]
+
+            output = "".join(output_tail)
+
+            if returncode != 0:
+                self._raise_command_error(returncode, command, output)
             else:
                 return output
 
@@ -149,7 +249,19 @@ class ActionExecutor:
             msg = f"Command timed out: {command}"
             raise CommandExecutionError(msg) from e
         except subprocess.CalledProcessError as e:
-            msg = f"Command failed with code {e.returncode}: {e.stderr}"
+            msg = f"Command failed with code {e.returncode}: {e.output}"
+            raise CommandExecutionError(msg) from e
+
+    def _run_builtin(self, cmd_list: list[str], command: str) -> str | None:
+        """Run a trivial command in-process, or return None if unsupported."""
+        handler = _BUILTIN_HANDLERS.get(cmd_list[0]) if cmd_list else None
+        if handler is None:
+            return None
+
+        try:
+            return handler(cmd_list[1:])
+        except OSError as e:
+            msg = f"Command failed: {command}: {e}"
             raise CommandExecutionError(msg) from e
 
     def _create_backup(self, action_id: str) -> None:
@@ -159,12 +271,14 @@ class ActionExecutor:
         # Create a simple backup of current system state
         backup_data = {
             "action_id": action_id,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "timestamp": _utcnow_iso(),
             "system_info": self._get_system_info(),
         }
 
-        with backup_path.open("w") as f:
-            json.dump(backup_data, f, indent=2)
+        # Backups are machine-read: write compact JSON, owner-only from creation
+        fd = os.open(backup_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(backup_data, f, separators=(",", ":"))
 
         logger.info(f"Created backup: {backup_path}")
 
@@ -195,9 +309,5 @@ class ActionExecutor:
             "architecture": platform.machine(),
             "cpu_count": psutil.cpu_count(),
             "memory_total": psutil.virtual_memory().total,
-            "disk_usage": (
-                psutil.disk_usage("/")._asdict()
-                if platform.system() != "Windows"
-                else psutil.disk_usage("C:\\")._asdict()
-            ),
+            "disk_usage": psutil.disk_usage(_STORAGE_PATH)._asdict(),
         }
@@ -4,14 +4,13 @@ import asyncio
 import signal
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from loguru import logger
 
-from .companion_client import AgentRequest, CompanionClient
-from .config import AgentConfig, ConfigManager
-from .device import DeviceScanner
-from .executor import ActionExecutor
+if TYPE_CHECKING:
+    from .config import AgentConfig
 
 # Default options to avoid B008 errors
 _CONFIG_OPTION = typer.Option(
@@ -22,14 +21,19 @@ _CONFIG_OPTION = typer.Option(
 class AgentDaemon:
     """Main agent daemon class."""
 
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: "AgentConfig"):
         """Initialize agent daemon."""
+        from .companion_client import CompanionClient  # noqa: PLC0415
+        from .device import DeviceScanner  # noqa: PLC0415
+        from .executor import ActionExecutor  # noqa: PLC0415
+
         self.config = config
         self.device_scanner = DeviceScanner()
         self.companion_client = CompanionClient(config)
         self.executor = ActionExecutor(config)
         self.running = False
         self.device_info = None
+        self._stopped = asyncio.Event()
 
     async def start(self) -> None:
         """Start the agent daemon."""
@@ -47,6 +51,8 @@ class AgentDaemon:
             return
 
         logger.info("Companion server is healthy")
+        # A previous stop() leaves the event set; clear it so polling waits again
+        self._stopped.clear()
         self.running = True
 
         # Start main loop
@@ -56,17 +62,19 @@ class AgentDaemon:
         """Stop the agent daemon."""
         logger.info("Stopping Ezra Agent Daemon")
         self.running = False
+        self._stopped.set()
 
     async def _main_loop(self) -> None:
         """Main agent loop."""
         while self.running:
             try:
-                # Check for new requests (polling)
-                # In a real implementation, this would be more sophisticated
-                await asyncio.sleep(self.config.polling_interval / 1000)
-
-                # For now, just log status
-                if self.running:
+                # Check for new requests (polling); stop() ends the wait early
+                try:
+                    await asyncio.wait_for(
+                        self._stopped.wait(),
+                        timeout=self.config.polling_interval / 1000,
+                    )
+                except TimeoutError:
                     logger.debug("Agent is running and healthy")
 
             except KeyboardInterrupt:
@@ -80,6 +88,8 @@ class AgentDaemon:
         self, user_prompt: str, context: dict | None = None,
     ) -> bool:
         """Process a user request."""
+        from .companion_client import AgentRequest  # noqa: PLC0415
+
         try:
             # Create agent request
             request = AgentRequest(
@@ -88,14 +98,18 @@ class AgentDaemon:
                 context=context,
             )
 
-            # Generate action plan
-            response = self.companion_client.generate_action_plan(request)
+            # Companion calls block on the network; run them off the event loop
+            # so concurrent requests overlap on the pooled HTTP session
+            response = await asyncio.to_thread(
+                self.companion_client.generate_action_plan, request,
+            )
             if not response:
                 logger.error("Failed to generate action plan")
                 return False
 
             # Verify signature
-            if not self.companion_client.verify_signature(
+            if not await asyncio.to_thread(
+                self.companion_client.verify_signature,
                 response.action_plan,
                 response.action_plan.get("signature", {}),
             ):
@@ -123,8 +137,7 @@ class AgentDaemon:
                 else:
                     logger.error(f"Action {result.action_id} failed: {result.error}")
                     failed_actions.append(result.action_id)
-            else:
-                return not failed_actions
+            return not failed_actions
 
         except (ValueError, RuntimeError, ConnectionError) as e:
             logger.error(f"Error processing request: {e}")
@@ -141,6 +154,8 @@ def start(
     daemon: bool = typer.Option(False, "--daemon", "-d", help="Run as daemon"),
 ):
     """Start the agent daemon."""
+    from .config import ConfigManager  # noqa: PLC0415
+
     # Load configuration
     config_manager = ConfigManager(config_file)
     config = config_manager.load()
@@ -159,13 +174,15 @@ def start(
     )
 
     if daemon:
-        # Set up daemon logging
+        # Set up daemon logging; file writes and rotation happen on loguru's
+        # worker thread so they don't stall action execution
         log_file = config.data_dir / "agent.log"
         logger.add(
             log_file,
             level=config.log_level.upper(),
             rotation="10 MB",
             retention="7 days",
+            enqueue=True,
         )
 
     # Create and start daemon
@@ -197,6 +214,8 @@ def request(
     config_file: Path | None = _CONFIG_OPTION,
 ):
     """Process a single request."""
+    from .config import ConfigManager  # noqa: PLC0415
+
     # Load configuration
     config_manager = ConfigManager(config_file)
     config = config_manager.load()
@@ -240,6 +259,10 @@ def status(
     config_file: Path | None = _CONFIG_OPTION,
 ):
     """Check agent status."""
+    from .companion_client import CompanionClient  # noqa: PLC0415
+    from .config import ConfigManager  # noqa: PLC0415
+    from .device import DeviceScanner  # noqa: PLC0415
+
     # Load configuration
     config_manager = ConfigManager(config_file)
     config = config_manager.load()
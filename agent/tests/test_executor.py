@@ -0,0 +1,127 @@
+"""Tests for the action executor."""
+
+import shlex
+import sys
+import time
+
+import pytest
+
+from ezra_agent import executor as executor_module
+from ezra_agent.config import AgentConfig
+from ezra_agent.executor import (
+    _BUILTIN_HANDLERS,
+    ActionExecutor,
+    _builtin_echo,
+    _builtin_mkdir,
+)
+
+# Far below the 30 s the killed commands would otherwise run
+_KILL_DEADLINE = 10
+
+
+@pytest.fixture
+def executor(tmp_path):
+    """Action executor writing backups under a temporary directory."""
+    return ActionExecutor(
+        AgentConfig(
+            companion_url="http://localhost", device_id="test", backup_dir=tmp_path,
+        ),
+    )
+
+
+def test_command_output_tolerates_invalid_utf8(executor):
+    """Undecodable output is replaced rather than stalling the command."""
+    script = "import sys; sys.stdout.buffer.write(b'\\xff' * 200000)"
+    result = executor.execute_action(
+        {"id": "a", "commands": [shlex.join([sys.executable, "-c", script])]},
+    )
+    assert result.status == "completed"
+    assert result.output == "\ufffd" * 200000
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell")
+def test_timeout_kills_children_holding_output(executor, monkeypatch):
+    """A timed-out command is killed along with children keeping its output open."""
+    monkeypatch.setattr(executor_module, "_COMMAND_TIMEOUT", 1)
+    start = time.monotonic()
+    result = executor.execute_action(
+        {"id": "a", "commands": ["sh -c 'sleep 30 & sleep 30'"]},
+    )
+    assert result.status == "failed"
+    assert "timed out" in result.error
+    assert time.monotonic() - start < _KILL_DEADLINE
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        ([], "\n"),
+        (["hello", "world"], "hello world\n"),
+        (["-n", "hello"], None),
+        (["-e", "a\\tb"], None),
+    ],
+)
+def test_builtin_echo(args, expected):
+    """echo runs in-process only without options."""
+    assert _builtin_echo(args) == expected
+
+
+def test_builtin_mkdir(tmp_path):
+    """mkdir creates each directory, requiring -p for missing parents."""
+    first, second = tmp_path / "a", tmp_path / "b"
+    assert _builtin_mkdir([str(first), str(second)]) == ""
+    assert first.is_dir()
+    assert second.is_dir()
+
+    with pytest.raises(FileExistsError):
+        _builtin_mkdir([str(first)])
+    with pytest.raises(FileNotFoundError):
+        _builtin_mkdir([str(tmp_path / "x" / "y")])
+
+
+def test_builtin_mkdir_parents(tmp_path):
+    """mkdir -p creates missing parents and accepts existing directories."""
+    nested = tmp_path / "x" / "y"
+    assert _builtin_mkdir(["-p", str(nested)]) == ""
+    assert nested.is_dir()
+    assert _builtin_mkdir(["-p", str(nested)]) == ""
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["-p"],
+        ["-m", "700", "dir"],
+        ["--", "dir"],
+        ["-p", "-v", "dir"],
+        ["dir", "--parents"],
+    ],
+)
+def test_builtin_mkdir_defers_unsupported_arguments(args, tmp_path, monkeypatch):
+    """mkdir leaves options other than a leading -p to the real tool."""
+    monkeypatch.chdir(tmp_path)
+    assert _builtin_mkdir(args) is None
+    assert not (tmp_path / "dir").exists()
+
+
+def test_rm_runs_the_real_tool(executor, tmp_path):
+    """rm is not reimplemented in-process."""
+    target = tmp_path / "file"
+    target.write_text("x")
+    assert "rm" not in _BUILTIN_HANDLERS
+
+    result = executor.execute_action(
+        {"id": "a", "commands": [shlex.join(["rm", "-f", str(target)])]},
+    )
+    assert result.status == "completed"
+    assert not target.exists()
+
+
+def test_builtin_error_fails_the_action(executor, tmp_path):
+    """An OSError from a builtin is reported as a failed action."""
+    result = executor.execute_action(
+        {"id": "a", "commands": [shlex.join(["mkdir", str(tmp_path)])]},
+    )
+    assert result.status == "failed"
+    assert "File exists" in result.error
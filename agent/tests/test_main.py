@@ -0,0 +1,72 @@
+"""Tests for the agent daemon."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ezra_agent.config import AgentConfig
+from ezra_agent.main import AgentDaemon
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """Daemon with an hour-long polling interval and no external services."""
+    daemon = AgentDaemon(
+        AgentConfig(
+            companion_url="http://localhost",
+            device_id="test",
+            polling_interval=3_600_000,
+            backup_dir=tmp_path,
+        ),
+    )
+    monkeypatch.setattr(
+        daemon.device_scanner,
+        "scan",
+        lambda _device_id: SimpleNamespace(platform="linux", os="test"),
+    )
+    monkeypatch.setattr(daemon.companion_client, "health_check", lambda: True)
+    return daemon
+
+
+def test_stop_interrupts_polling_wait(daemon):
+    """stop() ends the main loop without waiting out the polling interval."""
+
+    async def run() -> None:
+        task = asyncio.create_task(daemon.start())
+        await asyncio.sleep(0.05)
+        assert daemon.running
+        await daemon.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(run())
+    assert not daemon.running
+
+
+
+def test_restart_after_stop_waits_for_polling_interval(daemon, monkeypatch):
+    """A daemon started again after stop() waits between polls instead of spinning."""
+    waits = []
+    wait = daemon._stopped.wait
+
+    def counting_wait():
+        waits.append(None)
+        return wait()
+
+    monkeypatch.setattr(daemon._stopped, "wait", counting_wait)
+
+    async def run() -> None:
+        task = asyncio.create_task(daemon.start())
+        await asyncio.sleep(0.05)
+        await daemon.stop()
+        await asyncio.wait_for(task, timeout=1)
+        waits.clear()
+
+        task = asyncio.create_task(daemon.start())
+        await asyncio.sleep(0.05)
+        assert daemon.running
+        assert len(waits) == 1
+        await daemon.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(run())
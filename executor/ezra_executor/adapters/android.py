@@ -1,12 +1,45 @@
 """Android system adapter."""
 
+import atexit
 import os
-import shutil
+import queue
+import re
+import shlex
 import subprocess
+import threading
 import time
-from typing import Any
+from pathlib import Path
+from typing import IO, Any
 
-from .base import BaseAdapter, ExecutionResult, SystemInfo
+from .base import (
+    _STEP_MARKER,
+    BaseAdapter,
+    ExecutionResult,
+    SystemInfo,
+    _invalidates_packages,
+    _package_cached,
+    _parse_octal,
+)
+
+_ADB_SHELL_PREFIX = "adb shell "
+# Printed after each command sent to the persistent shell, followed by its exit code
+_ADB_SENTINEL = "__EZRA_EOF__"
+
+_PACKAGE_RE = re.compile(r"package:(\S+)")
+
+_PROBE_SEPARATOR = "__EZRA_SEP__"
+_COMMAND_CAPABILITIES = {
+    "adb": "adb_access",
+    "git": "git",
+    "python": "python",
+    "node": "nodejs",
+    "apt": "apt_package_manager",
+    "pkg": "pkg_package_manager",
+}
+_CAPABILITY_PROBE = (
+    f'su -c "id" 2>&1; echo {_PROBE_SEPARATOR}; '
+    f"for c in {' '.join(_COMMAND_CAPABILITIES)}; do command -v $c; done 2>/dev/null"
+)
 
 
 class AndroidAdapter(BaseAdapter):
@@ -14,6 +47,11 @@ class AndroidAdapter(BaseAdapter):
 
     def __init__(self):
         """Initialize Android adapter."""
+        # One long-lived `adb shell` amortizes the adb handshake across commands
+        self._adb_shell: subprocess.Popen | None = None
+        self._adb_lines: queue.Queue[tuple[str, str] | None] = queue.Queue()
+        self._adb_lock = threading.Lock()
+        atexit.register(self._close_adb_shell)
         super().__init__()
 
     def get_platform(self) -> str:
@@ -27,79 +65,203 @@ class AndroidAdapter(BaseAdapter):
             platform="android",
             version="Android (version detection limited)",
             architecture="arm64",  # Most modern Android devices
-            capabilities=self._capabilities,
+            capabilities=self.get_capabilities(),
         )
 
     def execute_command(self, command: str, timeout: int = 300) -> ExecutionResult:
         """Execute a system command."""
-        start_time = time.time()
+        if command.startswith(_ADB_SHELL_PREFIX):
+            try:
+                # adb joins its arguments, after host shell unquoting, with spaces
+                args = shlex.split(command.removeprefix(_ADB_SHELL_PREFIX))
+            except ValueError:
+                args = None  # Let the host shell report the quoting error
+            if args:
+                return self._exec_via_adb(" ".join(args), timeout)
+
+        start_time = time.perf_counter()
 
         try:
             # Android commands are limited without root
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False,
-            )
+            returncode, stdout, stderr = self._run_spooled(command, timeout)
 
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             return ExecutionResult(
-                success=result.returncode == 0,
-                output=result.stdout,
-                error=result.stderr if result.returncode != 0 else None,
-                exit_code=result.returncode,
+                success=returncode == 0,
+                output=stdout,
+                error=stderr if returncode != 0 else None,
+                exit_code=returncode,
                 duration=duration,
             )
 
-        except subprocess.TimeoutExpired:
-            duration = time.time() - start_time
+        except subprocess.TimeoutExpired as e:
+            duration = time.perf_counter() - start_time
             return ExecutionResult(
                 success=False,
+                output=e.output or "",
                 error=f"Command timed out after {timeout} seconds",
                 duration=duration,
             )
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             return ExecutionResult(
                 success=False,
                 error=str(e),
                 duration=duration,
             )
 
+    def _exec_via_adb(self, command: str, timeout: int) -> ExecutionResult:
+        """Run a command on the persistent adb shell."""
+        start_time = time.perf_counter()
+
+        with self._adb_lock:
+            try:
+                shell = self._ensure_adb_shell()
+                # Both streams end with the sentinel; stdout's carries the exit code
+                shell.stdin.write(
+                    f"({command}); echo {_ADB_SENTINEL}$?; echo {_ADB_SENTINEL} >&2\n",
+                )
+                shell.stdin.flush()
+
+                output: dict[str, list[str]] = {"stdout": [], "stderr": []}
+                exit_code = None
+                pending = 2
+                deadline = start_time + timeout
+                while pending:
+                    item = self._adb_lines.get(timeout=max(deadline - time.perf_counter(), 0))
+                    if item is None:
+                        self._close_adb_shell()
+                        return ExecutionResult(
+                            success=False,
+                            output="".join(output["stdout"]),
+                            error="adb shell exited unexpectedly",
+                            exit_code=-1,
+                            duration=time.perf_counter() - start_time,
+                        )
+                    stream, line = item
+                    marker = line.find(_ADB_SENTINEL)
+                    if marker == -1:
+                        output[stream].append(line)
+                        continue
+                    # Output without a trailing newline shares the sentinel's line
+                    output[stream].append(line[:marker])
+                    if stream == "stdout":
+                        exit_code = int(line[marker + len(_ADB_SENTINEL):])
+                    pending -= 1
+
+            except queue.Empty:
+                # The shell is still busy with the command; start fresh next time
+                self._close_adb_shell()
+                return ExecutionResult(
+                    success=False,
+                    output="".join(output["stdout"]),
+                    error=f"Command timed out after {timeout} seconds",
+                    duration=time.perf_counter() - start_time,
+                )
+            except Exception as e:
+                self._close_adb_shell()
+                return ExecutionResult(
+                    success=False,
+                    error=str(e),
+                    duration=time.perf_counter() - start_time,
+                )
+
+        return ExecutionResult(
+            success=exit_code == 0,
+            output="".join(output["stdout"]),
+            error="".join(output["stderr"]) if exit_code != 0 else None,
+            exit_code=exit_code,
+            duration=time.perf_counter() - start_time,
+        )
+
+    def _ensure_adb_shell(self) -> subprocess.Popen:
+        """Start the persistent adb shell if it is not running."""
+        if self._adb_shell is not None and self._adb_shell.poll() is None:
+            return self._adb_shell
+
+        self._adb_lines = queue.Queue()
+        self._adb_shell = subprocess.Popen(
+            ["adb", "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            bufsize=-1,
+        )
+        for stream in ("stdout", "stderr"):
+            threading.Thread(
+                target=self._pump_adb_output,
+                args=(getattr(self._adb_shell, stream), stream, self._adb_lines),
+                daemon=True,
+            ).start()
+        return self._adb_shell
+
+    @staticmethod
+    def _pump_adb_output(pipe: IO[str], stream: str, lines: queue.Queue) -> None:
+        """Forward adb shell output lines to the queue until the stream ends."""
+        for line in pipe:
+            lines.put((stream, line))
+        if stream == "stdout":
+            # The shell has exited
+            lines.put(None)
+
+    def _close_adb_shell(self) -> None:
+        """Terminate the persistent adb shell, if any."""
+        shell, self._adb_shell = self._adb_shell, None
+        if shell is not None and shell.poll() is None:
+            shell.kill()
+            shell.wait()
+
+    def execute_sequence(
+        self, commands: list[str], timeout: int = 300, *, batch: bool = True,
+    ) -> ExecutionResult:
+        """Execute commands in order, in one shell where possible."""
+        # adb shell commands must go through the persistent adb shell
+        if not batch or len(commands) <= 1 or any(
+            _STEP_MARKER in command or command.startswith(_ADB_SHELL_PREFIX)
+            for command in commands
+        ):
+            return super().execute_sequence(commands, timeout, batch=False)
+        return self._execute_script(commands, timeout)
+
+    @_invalidates_packages
     def install_package(self, package: str, **kwargs) -> ExecutionResult:
         """Install a package (APK)."""
         # Android package installation is limited without root
         if package.endswith(".apk"):
-            command = f"adb install {package}"
+            argv = ["adb", "install", package]
         else:
             # Try to install from Google Play (limited)
-            command = f'am start -a android.intent.action.VIEW -d "market://details?id={package}"'
+            argv = [
+                "am", "start", "-a", "android.intent.action.VIEW",
+                "-d", f"market://details?id={package}",
+            ]
 
-        return self.execute_command(command)
+        return self._execute_argv(argv)
 
+    @_invalidates_packages
     def uninstall_package(self, package: str, **kwargs) -> ExecutionResult:
         """Uninstall a package."""
-        command = f"adb uninstall {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["adb", "uninstall", package])
 
+    @_package_cached
     def list_packages(self) -> list[str]:
         """List installed packages."""
-        result = self.execute_command("pm list packages")
-        if result.success:
-            packages = []
-            for line in result.output.split("\n"):
-                if line.startswith("package:"):
-                    packages.append(line.replace("package:", ""))
-            return packages
-        return []
+        try:
+            return [
+                match.group(1)
+                for line in self._stream_lines(["pm", "list", "packages"])
+                if (match := _PACKAGE_RE.match(line))
+            ]
+        except Exception:
+            return []
 
+    @_package_cached
     def get_package_info(self, package: str) -> dict[str, Any] | None:
         """Get information about a package."""
-        result = self.execute_command(f"dumpsys package {package}")
+        result = self._execute_argv(["dumpsys", "package", package])
         if result.success:
             return {
                 "name": package,
@@ -111,20 +273,19 @@ class AndroidAdapter(BaseAdapter):
     def create_backup(self, source: str, destination: str) -> ExecutionResult:
         """Create a backup (limited on Android)."""
         # Android backup is limited without root
-        command = f'cp -r "{source}" "{destination}"'
-        return self.execute_command(command)
+        return self._execute_argv(["cp", "-r", source, destination])
 
     def restore_backup(self, backup_path: str, destination: str) -> ExecutionResult:
         """Restore from a backup."""
-        command = f'cp -r "{backup_path}" "{destination}"'
-        return self.execute_command(command)
+        return self._execute_argv(["cp", "-r", backup_path, destination])
 
     def modify_file(self, file_path: str, changes: dict[str, Any]) -> ExecutionResult:
         """Modify a file (limited on Android)."""
         if "content" in changes:
             try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(changes["content"])
+                self._write_content(
+                    file_path, changes["content"], fsync=changes.get("fsync", False),
+                )
                 return ExecutionResult(success=True, duration=0.0)
             except Exception as e:
                 return ExecutionResult(success=False, error=str(e), duration=0.0)
@@ -134,16 +295,7 @@ class AndroidAdapter(BaseAdapter):
     def get_file_info(self, file_path: str) -> dict[str, Any] | None:
         """Get file information."""
         try:
-            stat_info = os.stat(file_path)
-            return {
-                "path": file_path,
-                "size": stat_info.st_size,
-                "permissions": oct(stat_info.st_mode)[-3:],
-                "owner": stat_info.st_uid,
-                "group": stat_info.st_gid,
-                "modified": stat_info.st_mtime,
-                "exists": True,
-            }
+            return self._file_info(file_path, os.stat(file_path))
         except (OSError, FileNotFoundError):
             return None
 
@@ -151,15 +303,8 @@ class AndroidAdapter(BaseAdapter):
         """Set file permissions."""
         try:
             # Convert permissions string to octal
-            if isinstance(permissions, str):
-                if permissions.startswith("0"):
-                    perm_octal = int(permissions, 8)
-                else:
-                    perm_octal = int(permissions, 8)
-            else:
-                perm_octal = permissions
-
-            os.chmod(file_path, perm_octal)
+            mode = permissions if isinstance(permissions, int) else _parse_octal(permissions)
+            os.chmod(file_path, mode)
             return ExecutionResult(success=True, duration=0.0)
 
         except Exception as e:
@@ -169,7 +314,7 @@ class AndroidAdapter(BaseAdapter):
         """Get file permissions."""
         try:
             stat_info = os.stat(file_path)
-            return oct(stat_info.st_mode)[-3:]
+            return f"{stat_info.st_mode & 0o777:03o}"
         except (OSError, FileNotFoundError):
             return None
 
@@ -180,28 +325,14 @@ class AndroidAdapter(BaseAdapter):
         self._add_capability("process_management")
         self._add_capability("network")
 
-        # Check for ADB
-        if shutil.which("adb"):
-            self._add_capability("adb_access")
+        # Probe root access and tools in a single shell round-trip
+        result = self.execute_command(_CAPABILITY_PROBE)
+        id_output, _, found = result.output.partition(_PROBE_SEPARATOR)
 
-        # Check for root access
-        try:
-            result = self.execute_command('su -c "id"')
-            if result.success and "uid=0" in result.output:
-                self._add_capability("root_access")
-        except:
-            pass
-
-        # Check for development tools
-        if shutil.which("git"):
-            self._add_capability("git")
-        if shutil.which("python"):
-            self._add_capability("python")
-        if shutil.which("node"):
-            self._add_capability("nodejs")
-
-        # Check for package managers
-        if shutil.which("apt"):
-            self._add_capability("apt_package_manager")
-        if shutil.which("pkg"):
-            self._add_capability("pkg_package_manager")
+        if "uid=0" in id_output:
+            self._add_capability("root_access")
+
+        commands = {Path(line.strip()).name for line in found.splitlines() if line.strip()}
+        for command, capability in _COMMAND_CAPABILITIES.items():
+            if command in commands:
+                self._add_capability(capability)
@@ -1,28 +1,160 @@
 """Base adapter for system operations."""
 
+import asyncio
+import contextlib
+import copy
+import inspect
+import io
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from functools import cache, lru_cache, wraps
+from typing import IO, Any
 
-from pydantic import BaseModel, Field
+# Most command output kept per stream; earlier output is dropped
+_MAX_OUTPUT_BYTES = 16 << 20
 
+# Seconds a package query result is reused. Packages changed outside the
+# adapter's install/uninstall, e.g. through execute_command or another process,
+# can be reported stale for up to this long.
+_PACKAGE_CACHE_TTL = 60
 
-class ExecutionResult(BaseModel):
+
+# Printed to both streams before each step of a batched command sequence
+_STEP_MARKER = "__EZRA_STEP__"
+# Seconds between checks for a batched step's timeout, and most output read per read
+_STEP_POLL_SECONDS = 0.5
+_STEP_SCAN_BYTES = 1 << 20
+
+
+@cache
+def _which(command: str, path: str) -> str | None:
+    """Resolve a command on PATH, cached per PATH value."""
+    return shutil.which(command, path=path)
+
+
+@lru_cache(maxsize=256)
+def _parse_octal(permissions: str) -> int:
+    """Parse an octal permission string such as "644" or "0755"."""
+    return int(permissions, 8)
+
+
+def _read_tail(spool: IO[bytes]) -> str:
+    """Decode up to the last _MAX_OUTPUT_BYTES written to a spool file."""
+    size = spool.seek(0, io.SEEK_END)
+    spool.seek(max(size - _MAX_OUTPUT_BYTES, 0))
+    return io.TextIOWrapper(io.BytesIO(spool.read()), errors="replace").read()
+
+
+def _kill_process_tree(process: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session, and everything it started.
+
+    On Windows only the process itself is killed.
+    """
+    if os.name == "nt":
+        process.kill()
+        return
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def _after_last_marker(output: str) -> str:
+    """Return the output written after the last step marker."""
+    _, marker, tail = output.rpartition(f"{_STEP_MARKER}\n")
+    # Without a marker, long output pushed it out of the kept tail; all of
+    # the tail then belongs to the last step
+    return tail if marker else output
+
+
+def _package_cached(method: Callable) -> Callable:
+    """Reuse a package query's non-empty result for _PACKAGE_CACHE_TTL seconds.
+
+    Results are keyed by the bound arguments, so positional and keyword calls
+    share entries. The adapter's own package operations clear the cache;
+    changes made any other way show up once the entry expires.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self: "BaseAdapter", *args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, *bound.args[1:], *sorted(bound.kwargs.items()))
+        now = time.monotonic()
+        cached = self._package_cache.get(key)
+        if cached is not None and now - cached[0] < _PACKAGE_CACHE_TTL:
+            return copy.copy(cached[1])
+
+        result = method(self, *args, **kwargs)
+        if result:
+            self._package_cache[key] = (now, copy.copy(result))
+        return result
+
+    return wrapper
+
+
+def _invalidates_packages(method: Callable) -> Callable:
+    """Serialize a package operation and drop cached package queries after it.
+
+    Package managers hold a system-wide lock, so concurrent actions must not
+    run their operations at the same time.
+    """
+
+    @wraps(method)
+    def wrapper(self: "BaseAdapter", *args: Any, **kwargs: Any) -> Any:
+        with self._package_lock:
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._package_cache.clear()
+
+    return wrapper
+
+
+class _Record:
+    """Pydantic-style serialization for the adapter result dataclasses.
+
+    ExecutionResult and SystemInfo used to be pydantic models; these keep
+    their ``model_dump()`` and ``dict()`` callers working.
+    """
+
+    __slots__ = ()
+
+    def model_dump(self) -> dict[str, Any]:
+        """Return the fields as a dict, like pydantic's ``model_dump()``."""
+        return asdict(self)
+
+    def dict(self) -> dict[str, Any]:
+        """Return the fields as a dict, like pydantic v1's ``dict()``."""
+        return asdict(self)
+
+
+@dataclass(slots=True, kw_only=True)
+class ExecutionResult(_Record):
     """Execution result model."""
 
-    success: bool = Field(..., description="Whether the operation succeeded")
-    output: str = Field(default="", description="Command output")
-    error: str | None = Field(None, description="Error message")
-    exit_code: int = Field(default=0, description="Exit code")
-    duration: float = Field(..., description="Execution duration in seconds")
+    success: bool  # Whether the operation succeeded
+    output: str = ""  # Command output
+    error: str | None = None  # Error message
+    exit_code: int = 0  # Exit code
+    duration: float  # Execution duration in seconds
 
 
-class SystemInfo(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class SystemInfo(_Record):
     """System information model."""
 
-    platform: str = Field(..., description="Platform name")
-    version: str = Field(..., description="Platform version")
-    architecture: str = Field(..., description="System architecture")
-    capabilities: list[str] = Field(default_factory=list, description="System capabilities")
+    platform: str  # Platform name
+    version: str  # Platform version
+    architecture: str  # System architecture
+    capabilities: list[str] = field(default_factory=list)  # System capabilities
 
 
 class BaseAdapter(ABC):
@@ -30,7 +162,10 @@ class BaseAdapter(ABC):
 
     def __init__(self):
         """Initialize the adapter."""
-        self._capabilities: list[str] = []
+        # Keyed by capability; a dict gives O(1) lookups in detection order
+        self._capabilities: dict[str, None] = {}
+        self._package_cache: dict[tuple[Any, ...], tuple[float, Any]] = {}
+        self._package_lock = threading.Lock()
         self._detect_capabilities()
 
     @abstractmethod
@@ -45,6 +180,32 @@ class BaseAdapter(ABC):
     def execute_command(self, command: str, timeout: int = 300) -> ExecutionResult:
         """Execute a system command."""
 
+    async def execute_many(
+        self, commands: list[str], timeout: int = 300,
+    ) -> list[ExecutionResult]:
+        """Execute independent commands concurrently, returning results in order."""
+        return await asyncio.gather(
+            *(
+                asyncio.to_thread(self.execute_command, command, timeout)
+                for command in commands
+            ),
+        )
+
+    def execute_sequence(
+        self, commands: list[str], timeout: int = 300, *, batch: bool = True,
+    ) -> ExecutionResult:
+        """Execute commands in order, returning the first failure if any.
+
+        Adapters may run a batch of commands in a single shell invocation;
+        with batch=False each command gets its own execute_command call.
+        """
+        for command in commands:
+            result = self.execute_command(command, timeout)
+            if not result.success:
+                return result
+
+        return ExecutionResult(success=True, duration=0.0)
+
     @abstractmethod
     def install_package(self, package: str, **kwargs) -> ExecutionResult:
         """Install a package."""
@@ -85,9 +246,49 @@ class BaseAdapter(ABC):
     def get_permissions(self, file_path: str) -> str | None:
         """Get file permissions."""
 
+    def get_directory_info(self, directory: str) -> list[dict[str, Any]]:
+        """Get file information for every entry in a directory."""
+        infos = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        infos.append(self._file_info(entry.path, entry.stat(follow_symlinks=False)))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        return infos
+
+    @staticmethod
+    def _write_content(file_path: str, content: str, *, fsync: bool = False) -> None:
+        """Replace a file's content with a single encode and raw fd writes."""
+        data = memoryview(content.encode("utf-8"))
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _file_info(path: str, stat_info: os.stat_result) -> dict[str, Any]:
+        """Build the file information dict from a stat result."""
+        return {
+            "path": path,
+            "size": stat_info.st_size,
+            "permissions": f"{stat_info.st_mode & 0o777:03o}",
+            "owner": stat_info.st_uid,
+            "group": stat_info.st_gid,
+            "modified": stat_info.st_mtime,
+            "exists": True,
+        }
+
     def get_capabilities(self) -> list[str]:
         """Get system capabilities."""
-        return self._capabilities.copy()
+        return list(self._capabilities)
 
     def has_capability(self, capability: str) -> bool:
         """Check if system has a specific capability."""
@@ -97,12 +298,192 @@ class BaseAdapter(ABC):
     def _detect_capabilities(self) -> None:
         """Detect system capabilities."""
 
+    def _execute_argv(self, argv: list[str], timeout: int = 300) -> ExecutionResult:
+        """Execute a fixed-format internal command directly, without a shell."""
+        start_time = time.perf_counter()
+
+        try:
+            returncode, stdout, stderr = self._run_spooled(argv, timeout)
+        except subprocess.TimeoutExpired as e:
+            return ExecutionResult(
+                success=False,
+                output=e.output or "",
+                error=f"Command timed out after {timeout} seconds",
+                duration=time.perf_counter() - start_time,
+            )
+        except Exception as e:
+            return ExecutionResult(
+                success=False,
+                error=str(e),
+                duration=time.perf_counter() - start_time,
+            )
+
+        return ExecutionResult(
+            success=returncode == 0,
+            output=stdout,
+            error=stderr if returncode != 0 else None,
+            exit_code=returncode,
+            duration=time.perf_counter() - start_time,
+        )
+
+    def _execute_script(self, commands: list[str], timeout: int = 300) -> ExecutionResult:
+        """Execute commands in order in a single POSIX shell invocation.
+
+        Each command runs in its own subshell, as it would in a separate
+        execute_command call, and the script exits at the first failure. The
+        step markers written before each command give every command its own
+        timeout and let a failure be reported with that command's output only.
+        """
+        script = "\n".join(
+            f"echo {_STEP_MARKER}; echo {_STEP_MARKER} >&2\n(\n{command}\n) || exit"
+            for command in commands
+        )
+        start_time = time.perf_counter()
+
+        try:
+            with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+                process = subprocess.Popen(
+                    script, shell=True, stdout=stdout, stderr=stderr,
+                    start_new_session=True,
+                )
+                returncode = self._wait_for_steps(process, stdout, timeout)
+                output, error = _read_tail(stdout), _read_tail(stderr)
+        except Exception as e:
+            return ExecutionResult(
+                success=False,
+                error=str(e),
+                duration=time.perf_counter() - start_time,
+            )
+
+        duration = time.perf_counter() - start_time
+        if returncode is None:
+            return ExecutionResult(
+                success=False,
+                output=_after_last_marker(output),
+                error=f"Command timed out after {timeout} seconds",
+                duration=duration,
+            )
+        if returncode == 0:
+            return ExecutionResult(success=True, duration=duration)
+
+        return ExecutionResult(
+            success=False,
+            output=_after_last_marker(output),
+            error=_after_last_marker(error),
+            exit_code=returncode,
+            duration=duration,
+        )
+
+    @staticmethod
+    def _wait_for_steps(
+        process: subprocess.Popen, stdout: IO[bytes], timeout: int,
+    ) -> int | None:
+        """Wait for a batched script, allowing timeout seconds per step.
+
+        Each step marker appearing in stdout restarts the deadline. Returns the
+        exit code, or None if a step timed out and the script was killed.
+        """
+        marker = f"{_STEP_MARKER}\n".encode()
+        offset = 0
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return process.wait(
+                    timeout=max(min(_STEP_POLL_SECONDS, deadline - time.monotonic()), 0),
+                )
+            except subprocess.TimeoutExpired:
+                pass
+
+            # Look for markers written since the last poll; a partly written
+            # marker is searched again next time
+            while True:
+                data = os.pread(stdout.fileno(), _STEP_SCAN_BYTES, offset)
+                found = data.rfind(marker)
+                if found != -1:
+                    offset += found + len(marker)
+                    deadline = time.monotonic() + timeout
+                else:
+                    offset += max(len(data) - len(marker) + 1, 0)
+                if len(data) < _STEP_SCAN_BYTES:
+                    break
+
+            if time.monotonic() >= deadline:
+                _kill_process_tree(process)
+                process.wait()
+                return None
+
+    @staticmethod
+    def _run_spooled(command: str | list[str], timeout: int) -> tuple[int, str, str]:
+        """Run a command with its output spooled to temporary files.
+
+        Strings run through the shell; argument lists are executed directly.
+        Output never backs up in a pipe or accumulates in memory while the
+        command runs; only the last _MAX_OUTPUT_BYTES of each stream are read
+        back. On timeout the command is killed and TimeoutExpired carries the
+        output produced so far.
+        """
+        with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                command, shell=isinstance(command, str), stdout=stdout, stderr=stderr,
+            )
+            try:
+                returncode = process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired as e:
+                process.kill()
+                process.wait()
+                e.output = _read_tail(stdout)
+                e.stderr = _read_tail(stderr)
+                raise
+
+            return returncode, _read_tail(stdout), _read_tail(stderr)
+
+    @staticmethod
+    def _stream_lines(command: str | list[str], timeout: int = 300) -> Iterator[str]:
+        """Yield a command's output lines as they are produced.
+
+        The command is killed if it runs longer than timeout seconds. Once the
+        output is exhausted, raises TimeoutExpired if it was killed and
+        CalledProcessError if it failed.
+        """
+        expired = threading.Event()
+
+        with subprocess.Popen(
+            command,
+            shell=isinstance(command, str),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1 << 16,
+            start_new_session=os.name != "nt",
+        ) as process:
+
+            def expire() -> None:
+                expired.set()
+                # Children holding the pipe must exit too for the output to end
+                _kill_process_tree(process)
+
+            # Killing the command closes its output, ending the loop below
+            timer = threading.Timer(timeout, expire)
+            timer.daemon = True
+            timer.start()
+            try:
+                yield from process.stdout
+            finally:
+                timer.cancel()
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(command, timeout)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command)
+
+    @staticmethod
+    def _has_command(command: str) -> bool:
+        """Check if a command is available on PATH."""
+        return _which(command, os.environ.get("PATH", os.defpath)) is not None
+
     def _add_capability(self, capability: str) -> None:
         """Add a capability to the list."""
-        if capability not in self._capabilities:
-            self._capabilities.append(capability)
+        self._capabilities[capability] = None
 
     def _remove_capability(self, capability: str) -> None:
         """Remove a capability from the list."""
-        if capability in self._capabilities:
-            self._capabilities.remove(capability)
+        self._capabilities.pop(capability, None)
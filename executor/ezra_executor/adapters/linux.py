@@ -1,13 +1,90 @@
 """Linux system adapter."""
 
 import os
+import platform
+import re
 import shutil
+import stat
 import subprocess
+import tarfile
 import time
+from functools import cache, cached_property, partial
 from pathlib import Path
 from typing import Any
 
-from .base import BaseAdapter, ExecutionResult, SystemInfo
+from .base import (
+    _STEP_MARKER,
+    BaseAdapter,
+    ExecutionResult,
+    SystemInfo,
+    _invalidates_packages,
+    _package_cached,
+    _parse_octal,
+)
+
+# Installed rows of `dpkg -l` start with "ii"; the name is the next column
+_DPKG_INSTALLED_RE = re.compile(r"ii\s+(\S+)")
+_FIRST_FIELD_RE = re.compile(r"\s*(\S+)")
+
+_PACKAGE_MANAGERS = (
+    ("apt", "apt_package_manager"),
+    ("yum", "yum_package_manager"),
+    ("dnf", "dnf_package_manager"),
+    ("pacman", "pacman_package_manager"),
+    ("snap", "snap_package_manager"),
+)
+
+# Development and virtualization tools
+_TOOLS = (
+    ("git", "git"),
+    ("docker", "docker"),
+    ("python3", "python"),
+    ("node", "nodejs"),
+    ("kvm", "kvm_virtualization"),
+    ("virtualbox", "virtualbox"),
+)
+
+
+@cache
+def _read_os_release() -> dict[str, str] | None:
+    """Parse /etc/os-release, read once per process."""
+    try:
+        with open("/etc/os-release") as f:
+            os_info = {}
+            for line in f:
+                if "=" in line:
+                    key, value = line.strip().split("=", 1)
+                    os_info[key] = value.strip('"')
+            return os_info
+    except FileNotFoundError:
+        return None
+
+
+def _add_tree(tar: tarfile.TarFile, path: str, arcname: str) -> None:
+    """Add a file or directory tree to a tar stream."""
+    tar.add(path, arcname=arcname, recursive=False)
+    if stat.S_ISDIR(os.lstat(path).st_mode):
+        _add_directory(tar, path, arcname)
+
+
+def _add_directory(tar: tarfile.TarFile, path: str, arcname: str) -> None:
+    """Add a directory's contents, walking it with os.scandir.
+
+    Regular files are stat'ed through their open descriptor, so each entry's
+    path is resolved once.
+    """
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+
+    for entry in entries:
+        name = f"{arcname}/{entry.name}"
+        if entry.is_file(follow_symlinks=False):
+            with open(entry.path, "rb") as f:
+                tar.addfile(tar.gettarinfo(arcname=name, fileobj=f), f)
+        else:
+            tar.add(entry.path, arcname=name, recursive=False)
+            if entry.is_dir(follow_symlinks=False):
+                _add_directory(tar, entry.path, name)
 
 
 class LinuxAdapter(BaseAdapter):
@@ -23,74 +100,68 @@ class LinuxAdapter(BaseAdapter):
 
     def get_system_info(self) -> SystemInfo:
         """Get system information."""
-        import platform
-
-
         # Get distribution info
-        try:
-            with open("/etc/os-release") as f:
-                os_info = {}
-                for line in f:
-                    if "=" in line:
-                        key, value = line.strip().split("=", 1)
-                        os_info[key] = value.strip('"')
-
+        os_info = _read_os_release()
+        if os_info is not None:
             version = f"{os_info.get('NAME', 'Linux')} {os_info.get('VERSION', '')}"
-        except FileNotFoundError:
+        else:
             version = f"Linux {platform.release()}"
 
         return SystemInfo(
             platform="linux",
             version=version,
             architecture=platform.machine(),
-            capabilities=self._capabilities,
+            capabilities=self.get_capabilities(),
         )
 
     def execute_command(self, command: str, timeout: int = 300) -> ExecutionResult:
         """Execute a system command."""
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False,
-            )
+            returncode, stdout, stderr = self._run_spooled(command, timeout)
 
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             return ExecutionResult(
-                success=result.returncode == 0,
-                output=result.stdout,
-                error=result.stderr if result.returncode != 0 else None,
-                exit_code=result.returncode,
+                success=returncode == 0,
+                output=stdout,
+                error=stderr if returncode != 0 else None,
+                exit_code=returncode,
                 duration=duration,
             )
 
-        except subprocess.TimeoutExpired:
-            duration = time.time() - start_time
+        except subprocess.TimeoutExpired as e:
+            duration = time.perf_counter() - start_time
             return ExecutionResult(
                 success=False,
+                output=e.output or "",
                 error=f"Command timed out after {timeout} seconds",
                 duration=duration,
             )
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             return ExecutionResult(
                 success=False,
                 error=str(e),
                 duration=duration,
             )
 
+    def execute_sequence(
+        self, commands: list[str], timeout: int = 300, *, batch: bool = True,
+    ) -> ExecutionResult:
+        """Execute commands in order, in one shell where possible."""
+        if not batch or len(commands) <= 1 or any(_STEP_MARKER in command for command in commands):
+            return super().execute_sequence(commands, timeout, batch=False)
+        return self._execute_script(commands, timeout)
+
+    @_invalidates_packages
     def install_package(self, package: str, **kwargs) -> ExecutionResult:
         """Install a package using the appropriate package manager."""
         package_manager = kwargs.get("package_manager", "auto")
 
         if package_manager == "auto":
-            package_manager = self._detect_package_manager()
+            package_manager = self._package_manager
 
         if package_manager == "apt":
             return self._install_with_apt(package)
@@ -108,12 +179,13 @@ class LinuxAdapter(BaseAdapter):
             duration=0.0,
         )
 
+    @_invalidates_packages
     def uninstall_package(self, package: str, **kwargs) -> ExecutionResult:
         """Uninstall a package."""
         package_manager = kwargs.get("package_manager", "auto")
 
         if package_manager == "auto":
-            package_manager = self._detect_package_manager()
+            package_manager = self._package_manager
 
         if package_manager == "apt":
             return self._uninstall_with_apt(package)
@@ -131,37 +203,41 @@ class LinuxAdapter(BaseAdapter):
             duration=0.0,
         )
 
+    @_package_cached
     def list_packages(self) -> list[str]:
         """List installed packages."""
-        package_manager = self._detect_package_manager()
+        package_manager = self._package_manager
+        pattern = _FIRST_FIELD_RE
 
-        if package_manager == "apt":
-            result = self.execute_command('dpkg -l | grep "^ii" | awk "{print $2}"')
-        elif package_manager == "yum":
-            result = self.execute_command('yum list installed | awk "{print $1}"')
-        elif package_manager == "dnf":
-            result = self.execute_command('dnf list installed | awk "{print $1}"')
-        elif package_manager == "pacman":
-            result = self.execute_command('pacman -Q | awk "{print $1}"')
-        else:
+        try:
+            if package_manager == "apt":
+                lines = self._stream_lines(["dpkg", "-l"])
+                pattern = _DPKG_INSTALLED_RE
+            elif package_manager == "yum":
+                lines = self._stream_lines(["yum", "list", "installed"])
+            elif package_manager == "dnf":
+                lines = self._stream_lines(["dnf", "list", "installed"])
+            elif package_manager == "pacman":
+                lines = self._stream_lines(["pacman", "-Q"])
+            else:
+                return []
+            return [match.group(1) for line in lines if (match := pattern.match(line))]
+        except Exception:
             return []
 
-        if result.success:
-            return [pkg.strip() for pkg in result.output.split("\n") if pkg.strip()]
-        return []
-
+    @_package_cached
     def get_package_info(self, package: str) -> dict[str, Any] | None:
         """Get information about a package."""
-        package_manager = self._detect_package_manager()
+        package_manager = self._package_manager
 
         if package_manager == "apt":
-            result = self.execute_command(f"dpkg -s {package}")
+            result = self._execute_argv(["dpkg", "-s", package])
         elif package_manager == "yum":
-            result = self.execute_command(f"yum info {package}")
+            result = self._execute_argv(["yum", "info", package])
         elif package_manager == "dnf":
-            result = self.execute_command(f"dnf info {package}")
+            result = self._execute_argv(["dnf", "info", package])
         elif package_manager == "pacman":
-            result = self.execute_command(f"pacman -Qi {package}")
+            result = self._execute_argv(["pacman", "-Qi", package])
         else:
             return None
 
@@ -175,14 +251,46 @@ class LinuxAdapter(BaseAdapter):
         return None
 
     def create_backup(self, source: str, destination: str) -> ExecutionResult:
-        """Create a backup using tar."""
+        """Create a gzipped tar backup, compressing with pigz when available."""
+        start_time = time.perf_counter()
+
         # Ensure destination directory exists
         dest_path = Path(destination)
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create tar backup
-        command = f'tar -czf "{destination}" -C "{Path(source).parent}" "{Path(source).name}"'
-        return self.execute_command(command)
+        arcname = Path(source).name
+        try:
+            # pigz is an internal speed-up, not a capability the server plans around
+            pigz_path = shutil.which("pigz")
+            if pigz_path:
+                # Stream the archive through pigz to compress on every core
+                with open(destination, "wb") as out:
+                    pigz = subprocess.Popen([pigz_path, "-c"], stdin=subprocess.PIPE, stdout=out)
+                    try:
+                        with tarfile.open(fileobj=pigz.stdin, mode="w|") as tar:
+                            _add_tree(tar, source, arcname)
+                    finally:
+                        pigz.stdin.close()
+                        returncode = pigz.wait()
+                if returncode != 0:
+                    return ExecutionResult(
+                        success=False,
+                        error=f"pigz exited with code {returncode}",
+                        exit_code=returncode,
+                        duration=time.perf_counter() - start_time,
+                    )
+            else:
+                # Level 6 matches tar -z / gzip's default
+                with tarfile.open(destination, "w:gz", compresslevel=6) as tar:
+                    _add_tree(tar, source, arcname)
+        except Exception as e:
+            return ExecutionResult(
+                success=False,
+                error=str(e),
+                duration=time.perf_counter() - start_time,
+            )
+
+        return ExecutionResult(success=True, duration=time.perf_counter() - start_time)
 
     def restore_backup(self, backup_path: str, destination: str) -> ExecutionResult:
         """Restore from a tar backup."""
@@ -191,8 +299,7 @@ class LinuxAdapter(BaseAdapter):
         dest_path.mkdir(parents=True, exist_ok=True)
 
         # Extract tar backup
-        command = f'tar -xzf "{backup_path}" -C "{destination}"'
-        return self.execute_command(command)
+        return self._execute_argv(["tar", "-xzf", backup_path, "-C", destination])
 
     def modify_file(self, file_path: str, changes: dict[str, Any]) -> ExecutionResult:
         """Modify a file."""
@@ -202,8 +309,9 @@ class LinuxAdapter(BaseAdapter):
         if "content" in changes:
             # Replace entire file content
             try:
-                with open(file_path, "w") as f:
-                    f.write(changes["content"])
+                self._write_content(
+                    file_path, changes["content"], fsync=changes.get("fsync", False),
+                )
                 return ExecutionResult(success=True, duration=0.0)
             except Exception as e:
                 return ExecutionResult(success=False, error=str(e), duration=0.0)
@@ -213,16 +321,7 @@ class LinuxAdapter(BaseAdapter):
     def get_file_info(self, file_path: str) -> dict[str, Any] | None:
         """Get file information."""
         try:
-            stat_info = os.stat(file_path)
-            return {
-                "path": file_path,
-                "size": stat_info.st_size,
-                "permissions": oct(stat_info.st_mode)[-3:],
-                "owner": stat_info.st_uid,
-                "group": stat_info.st_gid,
-                "modified": stat_info.st_mtime,
-                "exists": True,
-            }
+            return self._file_info(file_path, os.stat(file_path))
         except (OSError, FileNotFoundError):
             return None
 
@@ -230,15 +329,8 @@ class LinuxAdapter(BaseAdapter):
         """Set file permissions."""
         try:
             # Convert permissions string to octal
-            if isinstance(permissions, str):
-                if permissions.startswith("0"):
-                    perm_octal = int(permissions, 8)
-                else:
-                    perm_octal = int(permissions, 8)
-            else:
-                perm_octal = permissions
-
-            os.chmod(file_path, perm_octal)
+            mode = permissions if isinstance(permissions, int) else _parse_octal(permissions)
+            os.chmod(file_path, mode)
             return ExecutionResult(success=True, duration=0.0)
 
         except Exception as e:
@@ -248,7 +340,7 @@ class LinuxAdapter(BaseAdapter):
         """Get file permissions."""
         try:
             stat_info = os.stat(file_path)
-            return oct(stat_info.st_mode)[-3:]
+            return f"{stat_info.st_mode & 0o777:03o}"
         except (OSError, FileNotFoundError):
             return None
 
@@ -259,102 +351,73 @@ class LinuxAdapter(BaseAdapter):
         self._add_capability("process_management")
         self._add_capability("network")
 
-        # Check for package managers
-        if shutil.which("apt"):
-            self._add_capability("apt_package_manager")
-        if shutil.which("yum"):
-            self._add_capability("yum_package_manager")
-        if shutil.which("dnf"):
-            self._add_capability("dnf_package_manager")
-        if shutil.which("pacman"):
-            self._add_capability("pacman_package_manager")
-        if shutil.which("snap"):
-            self._add_capability("snap_package_manager")
-
-        # Check for systemd
-        if Path("/etc/systemd").exists():
-            self._add_capability("systemd")
-
-        # Check for root access
-        if os.geteuid() == 0:
-            self._add_capability("root_access")
-
-        # Check for development tools
-        if shutil.which("git"):
-            self._add_capability("git")
-        if shutil.which("docker"):
-            self._add_capability("docker")
-        if shutil.which("python3"):
-            self._add_capability("python")
-        if shutil.which("node"):
-            self._add_capability("nodejs")
-
-        # Check for virtualization
-        if shutil.which("kvm"):
-            self._add_capability("kvm_virtualization")
-        if shutil.which("virtualbox"):
-            self._add_capability("virtualbox")
-
-    def _detect_package_manager(self) -> str:
-        """Detect the primary package manager."""
-        if shutil.which("apt"):
+        # Probes are recorded in table order so the capability list stays stable.
+        # Each is a cached PATH lookup or a single stat, so a thread pool would
+        # cost more than it could overlap.
+        probes = [
+            *((cap, partial(self._has_command, cmd)) for cmd, cap in _PACKAGE_MANAGERS),
+            ("systemd", Path("/etc/systemd").exists),
+            ("root_access", lambda: os.geteuid() == 0),
+            *((cap, partial(self._has_command, cmd)) for cmd, cap in _TOOLS),
+        ]
+        for capability, probe in probes:
+            if probe():
+                self._add_capability(capability)
+
+    @cached_property
+    def _package_manager(self) -> str:
+        """Primary package manager, detected once per adapter."""
+        if self._has_command("apt"):
             return "apt"
-        if shutil.which("dnf"):
+        if self._has_command("dnf"):
             return "dnf"
-        if shutil.which("yum"):
+        if self._has_command("yum"):
             return "yum"
-        if shutil.which("pacman"):
+        if self._has_command("pacman"):
             return "pacman"
-        if shutil.which("snap"):
+        if self._has_command("snap"):
             return "snap"
         return "unknown"
 
     def _install_with_apt(self, package: str) -> ExecutionResult:
         """Install package with apt."""
-        command = f"sudo apt update && sudo apt install -y {package}"
-        return self.execute_command(command)
+        result = self._execute_argv(["sudo", "apt", "update"])
+        if not result.success:
+            return result
+        return self._execute_argv(["sudo", "apt", "install", "-y", package])
 
     def _install_with_yum(self, package: str) -> ExecutionResult:
         """Install package with yum."""
-        command = f"sudo yum install -y {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "yum", "install", "-y", package])
 
     def _install_with_dnf(self, package: str) -> ExecutionResult:
         """Install package with dnf."""
-        command = f"sudo dnf install -y {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "dnf", "install", "-y", package])
 
     def _install_with_pacman(self, package: str) -> ExecutionResult:
         """Install package with pacman."""
-        command = f"sudo pacman -S --noconfirm {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "pacman", "-S", "--noconfirm", package])
 
     def _install_with_snap(self, package: str) -> ExecutionResult:
         """Install package with snap."""
-        command = f"sudo snap install {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "snap", "install", package])
 
     def _uninstall_with_apt(self, package: str) -> ExecutionResult:
         """Uninstall package with apt."""
-        command = f"sudo apt remove -y {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "apt", "remove", "-y", package])
 
     def _uninstall_with_yum(self, package: str) -> ExecutionResult:
         """Uninstall package with yum."""
-        command = f"sudo yum remove -y {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "yum", "remove", "-y", package])
 
     def _uninstall_with_dnf(self, package: str) -> ExecutionResult:
         """Uninstall package with dnf."""
-        command = f"sudo dnf remove -y {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "dnf", "remove", "-y", package])
 
     def _uninstall_with_pacman(self, package: str) -> ExecutionResult:
         """Uninstall package with pacman."""
-        command = f"sudo pacman -R --noconfirm {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "pacman", "-R", "--noconfirm", package])
 
     def _uninstall_with_snap(self, package: str) -> ExecutionResult:
         """Uninstall package with snap."""
-        command = f"sudo snap remove {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["sudo", "snap", "remove", package])
@@ -1,13 +1,240 @@
 """Windows system adapter."""
 
+import atexit
+import base64
+import ctypes
 import os
+import queue
+import re
 import shutil
 import subprocess
+import threading
 import time
+from collections.abc import Callable
+from functools import cache, cached_property, partial
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, ClassVar
+
+from loguru import logger
+
+from .base import (
+    BaseAdapter,
+    ExecutionResult,
+    SystemInfo,
+    _invalidates_packages,
+    _package_cached,
+    _which,
+)
+
+# In order of preference
+_PACKAGE_MANAGERS = (
+    ("choco", "chocolatey_package_manager"),
+    ("winget", "winget_package_manager"),
+    ("scoop", "scoop_package_manager"),
+)
+
+# First column of a package table row, skipping header and separator rows
+_TABLE_ROW_RE = re.compile(r"(?!Name\b|-{2,})\s*(\S+)")
+# `choco list --limit-output` prints name|version rows
+_CHOCO_ROW_RE = re.compile(r"([^|\s]+)\|")
+
+# Development and virtualization tools
+_TOOLS = (
+    ("git", "git"),
+    ("docker", "docker"),
+    ("python", "python"),
+    ("node", "nodejs"),
+    ("virtualbox", "virtualbox"),
+    ("hyper-v", "hyper_v"),
+)
+
+# robocopy exit codes are bit flags; values below 8 report a successful copy
+_ROBOCOPY_FAILURE = 8
+_ROBOCOPY_THREADS = 8
+
+_POWERSHELL_PREFIXES = ("powershell", "pwsh")
+# Skip profile loading and prompts, which only slow down non-interactive use
+_POWERSHELL_FLAGS = "-NoProfile -NonInteractive"
+
+# Printed on both streams after each command sent to the persistent
+# PowerShell host; the stdout one is followed by the exit code
+_PS_SENTINEL = "__EZRA_EOF__"
+# Runs one base64-encoded command on the host. Each command gets a fresh
+# runspace, so locations, variables and functions never carry over, and its
+# environment variable changes (which are process-wide) are undone afterwards.
+# The command runs as a script file, where `exit N` ends the script with exit
+# code N rather than shutting down the host.
+_PS_HOST_RUNNER = f"""
+function global:Invoke-EzraCommand([string]$Encoded) {{
+    $path = Join-Path ([IO.Path]::GetTempPath()) "ezra-$([Guid]::NewGuid()).ps1"
+    $script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($Encoded))
+    [IO.File]::WriteAllText($path, $script, [Text.UTF8Encoding]::new($true))
+    $environment = [Environment]::GetEnvironmentVariables()
+    $ps = [PowerShell]::Create()
+    $code = 1
+    try {{
+        $ps.AddScript('$global:LASTEXITCODE = 0; & $args[0]; $global:EzraOk = $?').AddArgument($path) | Out-Null
+        $ps.Invoke() | Out-String -Stream
+        $state = $ps.Runspace.SessionStateProxy
+        $exitCode = $state.GetVariable('LASTEXITCODE')
+        $code = if ($exitCode) {{ $exitCode }} elseif ($state.GetVariable('EzraOk')) {{ 0 }} else {{ 1 }}
+    }} catch {{
+        [Console]::Error.WriteLine(($_ | Out-String).TrimEnd())
+    }} finally {{
+        foreach ($record in $ps.Streams.Error) {{
+            [Console]::Error.WriteLine(($record | Out-String).TrimEnd())
+        }}
+        $ps.Dispose()
+        Remove-Item -LiteralPath $path -ErrorAction SilentlyContinue
+        foreach ($name in @([Environment]::GetEnvironmentVariables().Keys)) {{
+            if (-not $environment.Contains($name)) {{
+                [Environment]::SetEnvironmentVariable($name, $null)
+            }}
+        }}
+        foreach ($entry in $environment.GetEnumerator()) {{
+            [Environment]::SetEnvironmentVariable($entry.Key, $entry.Value)
+        }}
+    }}
+    [Console]::Error.WriteLine('{_PS_SENTINEL}')
+    '{_PS_SENTINEL}' + $code
+}}
+"""
+# Sent once per host; `-Command -` runs stdin line by line, so the multi-line
+# runner arrives base64-encoded as a single statement
+_PS_HOST_SETUP = (
+    "[Console]::OutputEncoding = [Text.Encoding]::UTF8; "
+    ". ([ScriptBlock]::Create([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String("
+    f"'{base64.b64encode(_PS_HOST_RUNNER.encode('utf-8')).decode('ascii')}'))))\n"
+)
+# The command arrives base64-encoded so multi-line scripts stay one statement
+_PS_HOST_COMMAND = "Invoke-EzraCommand '{script}'\n"
+
+
+# Win32 ACL constants, for granting access without spawning icacls
+_SE_FILE_OBJECT = 1
+_DACL_SECURITY_INFORMATION = 0x4
+_FILE_ALL_ACCESS = 0x1F01FF
+_GRANT_ACCESS = 1
+_NO_INHERITANCE = 0
+_TRUSTEE_IS_SID = 0
+_TRUSTEE_IS_WELL_KNOWN_GROUP = 5
+_EVERYONE_SID = "S-1-1-0"
+
+
+class _Trustee(ctypes.Structure):
+    """Win32 TRUSTEE_W."""
+
+    _fields_ = (
+        ("pMultipleTrustee", ctypes.c_void_p),
+        ("MultipleTrusteeOperation", ctypes.c_int),
+        ("TrusteeForm", ctypes.c_int),
+        ("TrusteeType", ctypes.c_int),
+        ("ptstrName", ctypes.c_void_p),
+    )
+
+
+class _ExplicitAccess(ctypes.Structure):
+    """Win32 EXPLICIT_ACCESS_W."""
+
+    _fields_ = (
+        ("grfAccessPermissions", ctypes.c_uint32),
+        ("grfAccessMode", ctypes.c_int),
+        ("grfInheritance", ctypes.c_uint32),
+        ("Trustee", _Trustee),
+    )
+
+
+@cache
+def _win32_security() -> tuple[ctypes.CDLL, ctypes.CDLL]:
+    """Load advapi32 and kernel32 with prototypes for the ACL calls.
+
+    Private WinDLL handles keep these prototypes from leaking into other users
+    of ``ctypes.windll``.
+    """
+    advapi32 = ctypes.WinDLL("advapi32")
+    kernel32 = ctypes.WinDLL("kernel32")
+    pointer = ctypes.POINTER(ctypes.c_void_p)
+
+    advapi32.ConvertStringSidToSidW.argtypes = (ctypes.c_wchar_p, pointer)
+    advapi32.ConvertStringSidToSidW.restype = ctypes.c_int
+    advapi32.GetNamedSecurityInfoW.argtypes = (
+        ctypes.c_wchar_p, ctypes.c_int, ctypes.c_uint32,
+        pointer, pointer, pointer, pointer, pointer,
+    )
+    advapi32.GetNamedSecurityInfoW.restype = ctypes.c_uint32
+    advapi32.SetEntriesInAclW.argtypes = (
+        ctypes.c_uint32, ctypes.POINTER(_ExplicitAccess), ctypes.c_void_p, pointer,
+    )
+    advapi32.SetEntriesInAclW.restype = ctypes.c_uint32
+    advapi32.SetNamedSecurityInfoW.argtypes = (
+        ctypes.c_wchar_p, ctypes.c_int, ctypes.c_uint32,
+        ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+    )
+    advapi32.SetNamedSecurityInfoW.restype = ctypes.c_uint32
+    kernel32.LocalFree.argtypes = (ctypes.c_void_p,)
+    kernel32.LocalFree.restype = ctypes.c_void_p
+    return advapi32, kernel32
+
+
+@cache
+def _everyone_sid() -> ctypes.c_void_p:
+    """Get the well-known Everyone SID, converted once per process."""
+    advapi32, _ = _win32_security()
+    sid = ctypes.c_void_p()
+    if not advapi32.ConvertStringSidToSidW(_EVERYONE_SID, ctypes.byref(sid)):
+        raise ctypes.WinError()
+    return sid
+
+
+def _grant_everyone_full_access(path: str) -> None:
+    """Add an Everyone full-control entry to a file's DACL, like icacls /grant Everyone:F."""
+    advapi32, kernel32 = _win32_security()
+
+    dacl = ctypes.c_void_p()
+    descriptor = ctypes.c_void_p()
+    error = advapi32.GetNamedSecurityInfoW(
+        path, _SE_FILE_OBJECT, _DACL_SECURITY_INFORMATION,
+        None, None, ctypes.byref(dacl), None, ctypes.byref(descriptor),
+    )
+    if error:
+        raise ctypes.WinError(error)
+
+    try:
+        access = _ExplicitAccess(
+            grfAccessPermissions=_FILE_ALL_ACCESS,
+            grfAccessMode=_GRANT_ACCESS,
+            grfInheritance=_NO_INHERITANCE,
+            Trustee=_Trustee(
+                TrusteeForm=_TRUSTEE_IS_SID,
+                TrusteeType=_TRUSTEE_IS_WELL_KNOWN_GROUP,
+                ptstrName=_everyone_sid(),
+            ),
+        )
+        # Merge the entry into the existing DACL rather than replacing it
+        new_dacl = ctypes.c_void_p()
+        error = advapi32.SetEntriesInAclW(1, ctypes.byref(access), dacl, ctypes.byref(new_dacl))
+        if error:
+            raise ctypes.WinError(error)
+
+        try:
+            error = advapi32.SetNamedSecurityInfoW(
+                path, _SE_FILE_OBJECT, _DACL_SECURITY_INFORMATION,
+                None, None, new_dacl, None,
+            )
+            if error:
+                raise ctypes.WinError(error)
+        finally:
+            kernel32.LocalFree(new_dacl)
+    finally:
+        kernel32.LocalFree(descriptor)
+
 
-from .base import BaseAdapter, ExecutionResult, SystemInfo
+def _is_admin() -> bool:
+    """Check whether the process runs with administrator rights."""
+    try:
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
+    except (AttributeError, OSError):
+        return False
 
 
 class WindowsAdapter(BaseAdapter):
@@ -15,6 +242,13 @@ class WindowsAdapter(BaseAdapter):
 
     def __init__(self):
         """Initialize Windows adapter."""
+        # Prefer PowerShell Core, which starts faster than Windows PowerShell
+        self._powershell = shutil.which("pwsh") or shutil.which("powershell") or "powershell"
+        # One long-lived PowerShell host amortizes engine startup across commands
+        self._ps_host: subprocess.Popen | None = None
+        self._ps_lines: queue.Queue[tuple[str, str] | None] = queue.Queue()
+        self._ps_lock = threading.Lock()
+        atexit.register(self._close_ps_host)
         super().__init__()
 
     def get_platform(self) -> str:
@@ -29,134 +263,254 @@ class WindowsAdapter(BaseAdapter):
             platform="windows",
             version=f"Windows {platform.release()} {platform.version()}",
             architecture=platform.machine(),
-            capabilities=self._capabilities,
+            capabilities=self.get_capabilities(),
         )
 
     def execute_command(self, command: str, timeout: int = 300) -> ExecutionResult:
         """Execute a system command."""
-        start_time = time.time()
+        if not command.startswith(_POWERSHELL_PREFIXES):
+            result = self._exec_via_host(command, timeout)
+            if result is not None:
+                return result
+
+        start_time = time.perf_counter()
 
         try:
             # Use PowerShell for better Windows compatibility
-            if command.startswith("powershell") or command.startswith("pwsh"):
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    check=False,
-                )
+            if command.startswith(_POWERSHELL_PREFIXES):
+                ps_command = self._with_powershell_flags(command)
             else:
                 # Wrap in PowerShell for better error handling
-                ps_command = f'powershell -Command "& {{{command}}}"'
-                result = subprocess.run(
-                    ps_command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    check=False,
+                ps_command = (
+                    f'"{self._powershell}" {_POWERSHELL_FLAGS} -Command "& {{{command}}}"'
                 )
+            returncode, stdout, stderr = self._run_spooled(ps_command, timeout)
 
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             return ExecutionResult(
-                success=result.returncode == 0,
-                output=result.stdout,
-                error=result.stderr if result.returncode != 0 else None,
-                exit_code=result.returncode,
+                success=returncode == 0,
+                output=stdout,
+                error=stderr if returncode != 0 else None,
+                exit_code=returncode,
                 duration=duration,
             )
 
-        except subprocess.TimeoutExpired:
-            duration = time.time() - start_time
+        except subprocess.TimeoutExpired as e:
+            duration = time.perf_counter() - start_time
             return ExecutionResult(
                 success=False,
+                output=e.output or "",
                 error=f"Command timed out after {timeout} seconds",
                 duration=duration,
             )
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             return ExecutionResult(
                 success=False,
                 error=str(e),
                 duration=duration,
             )
 
+    @staticmethod
+    def _with_powershell_flags(command: str) -> str:
+        """Add the non-interactive flags to an explicit PowerShell command line."""
+        executable, _, arguments = command.partition(" ")
+        if "-noprofile" in arguments.lower():
+            return command
+        return f"{executable} {_POWERSHELL_FLAGS} {arguments}".rstrip()
+
+    def _exec_via_host(self, command: str, timeout: int) -> ExecutionResult | None:
+        """Run a command on the persistent PowerShell host.
+
+        Returns None when the host cannot take the command, so the caller can
+        fall back to a one-shot PowerShell process.
+        """
+        start_time = time.perf_counter()
+        script = base64.b64encode(command.encode("utf-8")).decode("ascii")
+
+        with self._ps_lock:
+            try:
+                host = self._ensure_ps_host()
+                host.stdin.write(_PS_HOST_COMMAND.format(script=script))
+                host.stdin.flush()
+            except OSError:
+                self._close_ps_host()
+                return None
+
+            try:
+                output: dict[str, list[str]] = {"stdout": [], "stderr": []}
+                exit_code = None
+                pending = 2
+                deadline = start_time + timeout
+                while pending:
+                    item = self._ps_lines.get(timeout=max(deadline - time.perf_counter(), 0))
+                    if item is None:
+                        self._close_ps_host()
+                        return ExecutionResult(
+                            success=False,
+                            output="".join(output["stdout"]),
+                            error="PowerShell host exited unexpectedly",
+                            exit_code=-1,
+                            duration=time.perf_counter() - start_time,
+                        )
+                    stream, line = item
+                    marker = line.find(_PS_SENTINEL)
+                    if marker == -1:
+                        output[stream].append(line)
+                        continue
+                    output[stream].append(line[:marker])
+                    if stream == "stdout":
+                        exit_code = int(line[marker + len(_PS_SENTINEL):])
+                    pending -= 1
+
+            except queue.Empty:
+                # The host is still busy with the command; start fresh next time
+                self._close_ps_host()
+                return ExecutionResult(
+                    success=False,
+                    output="".join(output["stdout"]),
+                    error=f"Command timed out after {timeout} seconds",
+                    duration=time.perf_counter() - start_time,
+                )
+            except Exception as e:
+                self._close_ps_host()
+                return ExecutionResult(
+                    success=False,
+                    error=str(e),
+                    duration=time.perf_counter() - start_time,
+                )
+
+        return ExecutionResult(
+            success=exit_code == 0,
+            output="".join(output["stdout"]),
+            error="".join(output["stderr"]) if exit_code != 0 else None,
+            exit_code=exit_code,
+            duration=time.perf_counter() - start_time,
+        )
+
+    def _ensure_ps_host(self) -> subprocess.Popen:
+        """Start the persistent PowerShell host if it is not running."""
+        if self._ps_host is not None and self._ps_host.poll() is None:
+            return self._ps_host
+
+        self._ps_lines = queue.Queue()
+        self._ps_host = subprocess.Popen(
+            [
+                self._powershell, "-NoProfile", "-NoLogo", "-NonInteractive",
+                # Commands run as temporary script files
+                "-ExecutionPolicy", "Bypass", "-Command", "-",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=-1,
+        )
+        for stream in ("stdout", "stderr"):
+            threading.Thread(
+                target=self._pump_ps_output,
+                args=(getattr(self._ps_host, stream), stream, self._ps_lines),
+                daemon=True,
+            ).start()
+        self._ps_host.stdin.write(_PS_HOST_SETUP)
+        return self._ps_host
+
+    @staticmethod
+    def _pump_ps_output(pipe: IO[str], stream: str, lines: queue.Queue) -> None:
+        """Forward PowerShell host output lines to the queue until the stream ends."""
+        for line in pipe:
+            lines.put((stream, line))
+        if stream == "stdout":
+            # The host has exited
+            lines.put(None)
+
+    def _close_ps_host(self) -> None:
+        """Shut down the persistent PowerShell host, if any."""
+        host, self._ps_host = self._ps_host, None
+        if host is None or host.poll() is not None:
+            return
+        try:
+            # End of input lets the host exit on its own
+            host.stdin.close()
+            host.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            host.kill()
+            host.wait()
+
+    @_invalidates_packages
     def install_package(self, package: str, **kwargs) -> ExecutionResult:
         """Install a package using the appropriate package manager."""
         package_manager = kwargs.get("package_manager", "auto")
 
         if package_manager == "auto":
-            package_manager = self._detect_package_manager()
+            package_manager = self._package_manager
 
-        if package_manager == "choco":
-            return self._install_with_choco(package)
-        if package_manager == "winget":
-            return self._install_with_winget(package)
-        if package_manager == "scoop":
-            return self._install_with_scoop(package)
-        return ExecutionResult(
-            success=False,
-            error=f"Unsupported package manager: {package_manager}",
-            duration=0.0,
-        )
+        installer = self._INSTALLERS.get(package_manager)
+        if installer is None:
+            return ExecutionResult(
+                success=False,
+                error=f"Unsupported package manager: {package_manager}",
+                duration=0.0,
+            )
+        return installer(self, package)
 
+    @_invalidates_packages
     def uninstall_package(self, package: str, **kwargs) -> ExecutionResult:
         """Uninstall a package."""
         package_manager = kwargs.get("package_manager", "auto")
 
         if package_manager == "auto":
-            package_manager = self._detect_package_manager()
+            package_manager = self._package_manager
 
-        if package_manager == "choco":
-            return self._uninstall_with_choco(package)
-        if package_manager == "winget":
-            return self._uninstall_with_winget(package)
-        if package_manager == "scoop":
-            return self._uninstall_with_scoop(package)
-        return ExecutionResult(
-            success=False,
-            error=f"Unsupported package manager: {package_manager}",
-            duration=0.0,
-        )
+        uninstaller = self._UNINSTALLERS.get(package_manager)
+        if uninstaller is None:
+            return ExecutionResult(
+                success=False,
+                error=f"Unsupported package manager: {package_manager}",
+                duration=0.0,
+            )
+        return uninstaller(self, package)
 
+    @_package_cached
     def list_packages(self) -> list[str]:
         """List installed packages."""
-        package_manager = self._detect_package_manager()
+        package_manager = self._package_manager
+
+        pattern = _TABLE_ROW_RE
 
         if package_manager == "choco":
-            result = self.execute_command("choco list --local-only")
+            argv = ["choco", "list", "--local-only", "--limit-output"]
+            pattern = _CHOCO_ROW_RE
         elif package_manager == "winget":
-            result = self.execute_command("winget list")
+            argv = ["winget", "list"]
         elif package_manager == "scoop":
-            result = self.execute_command("scoop list")
+            argv = ["scoop", "list"]
         else:
             return []
 
-        if result.success:
-            # Parse package list (simplified)
-            lines = result.output.split("\n")
-            packages = []
-            for line in lines:
-                if line.strip() and not line.startswith("Name"):
-                    parts = line.split()
-                    if parts:
-                        packages.append(parts[0])
-            return packages
-        return []
+        try:
+            # Parse package list (simplified) as the output arrives
+            return [
+                match.group(1)
+                for line in self._stream_lines(self._resolve_argv(argv))
+                if (match := pattern.match(line))
+            ]
+        except Exception:
+            return []
 
+    @_package_cached
     def get_package_info(self, package: str) -> dict[str, Any] | None:
         """Get information about a package."""
-        package_manager = self._detect_package_manager()
+        package_manager = self._package_manager
 
         if package_manager == "choco":
-            result = self.execute_command(f"choco info {package}")
+            result = self._execute_argv(["choco", "info", package])
         elif package_manager == "winget":
-            result = self.execute_command(f"winget show {package}")
+            result = self._execute_argv(["winget", "show", package])
         elif package_manager == "scoop":
-            result = self.execute_command(f"scoop info {package}")
+            result = self._execute_argv(["scoop", "info", package])
         else:
             return None
 
@@ -175,8 +529,7 @@ class WindowsAdapter(BaseAdapter):
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Use robocopy for better Windows compatibility
-        command = f'robocopy "{source}" "{destination}" /E /COPYALL'
-        return self.execute_command(command)
+        return self._robocopy(source, destination)
 
     def restore_backup(self, backup_path: str, destination: str) -> ExecutionResult:
         """Restore from a backup."""
@@ -185,8 +538,19 @@ class WindowsAdapter(BaseAdapter):
         dest_path.mkdir(parents=True, exist_ok=True)
 
         # Use robocopy to restore
-        command = f'robocopy "{backup_path}" "{destination}" /E /COPYALL'
-        return self.execute_command(command)
+        return self._robocopy(backup_path, destination)
+
+    def _robocopy(self, source: str, destination: str) -> ExecutionResult:
+        """Copy a directory tree with robocopy, keeping ACLs and ownership."""
+        # Multithreaded copy; skip per-file listings and progress output
+        result = self._execute_argv([
+            "robocopy", source, destination,
+            "/E", "/COPYALL", f"/MT:{_ROBOCOPY_THREADS}", "/NFL", "/NDL", "/NP",
+        ])
+        if 0 < result.exit_code < _ROBOCOPY_FAILURE:
+            result.success = True
+            result.error = None
+        return result
 
     def modify_file(self, file_path: str, changes: dict[str, Any]) -> ExecutionResult:
         """Modify a file."""
@@ -204,38 +568,47 @@ class WindowsAdapter(BaseAdapter):
     def get_file_info(self, file_path: str) -> dict[str, Any] | None:
         """Get file information."""
         try:
-            stat_info = os.stat(file_path)
-            return {
-                "path": file_path,
-                "size": stat_info.st_size,
-                "permissions": oct(stat_info.st_mode)[-3:],
-                "owner": stat_info.st_uid,
-                "group": stat_info.st_gid,
-                "modified": stat_info.st_mtime,
-                "exists": True,
-            }
+            return self._file_info(file_path, os.stat(file_path))
         except (OSError, FileNotFoundError):
             return None
 
     def set_permissions(self, file_path: str, permissions: str) -> ExecutionResult:
-        """Set file permissions using icacls."""
+        """Set file permissions through the Win32 security API, or icacls."""
+        start_time = time.perf_counter()
+        try:
+            _grant_everyone_full_access(file_path)
+            return ExecutionResult(success=True, duration=time.perf_counter() - start_time)
+        except (AttributeError, OSError, ctypes.ArgumentError) as e:
+            # Fall back to icacls, which also reports failures in its own terms
+            logger.warning(f"Win32 permission update failed for {file_path}, using icacls: {e}")
+
         try:
             # Use icacls for Windows permissions
-            command = f'icacls "{file_path}" /grant Everyone:F'
-            return self.execute_command(command)
+            return self._execute_argv(["icacls", file_path, "/grant", "Everyone:F"])
         except Exception as e:
             return ExecutionResult(success=False, error=str(e), duration=0.0)
 
     def get_permissions(self, file_path: str) -> str | None:
         """Get file permissions using icacls."""
         try:
-            result = self.execute_command(f'icacls "{file_path}"')
+            result = self._execute_argv(["icacls", file_path])
             if result.success:
                 return result.output
             return None
         except Exception:
             return None
 
+    def _execute_argv(self, argv: list[str], timeout: int = 300) -> ExecutionResult:
+        """Execute an internal command directly, without cmd.exe or PowerShell."""
+        return super()._execute_argv(self._resolve_argv(argv), timeout)
+
+    @staticmethod
+    def _resolve_argv(argv: list[str]) -> list[str]:
+        """Replace the command name with its full path on PATH."""
+        # A full path also lets .cmd shims such as scoop's run without a shell
+        executable = _which(argv[0], os.environ.get("PATH", os.defpath)) or argv[0]
+        return [executable, *argv[1:]]
+
     def _detect_capabilities(self) -> None:
         """Detect Windows system capabilities."""
         # Basic capabilities
@@ -245,78 +618,59 @@ class WindowsAdapter(BaseAdapter):
         self._add_capability("powershell")
         self._add_capability("registry_access")
 
-        # Check for package managers
-        if shutil.which("choco"):
-            self._add_capability("chocolatey_package_manager")
-        if shutil.which("winget"):
-            self._add_capability("winget_package_manager")
-        if shutil.which("scoop"):
-            self._add_capability("scoop_package_manager")
-
-        # Check for Windows services
-        if Path("C:\\Windows\\System32\\services.exe").exists():
-            self._add_capability("windows_services")
-
-        # Check for administrator access
-        try:
-            import ctypes
-            if ctypes.windll.shell32.IsUserAnAdmin():
-                self._add_capability("administrator_access")
-        except:
-            pass
-
-        # Check for development tools
-        if shutil.which("git"):
-            self._add_capability("git")
-        if shutil.which("docker"):
-            self._add_capability("docker")
-        if shutil.which("python"):
-            self._add_capability("python")
-        if shutil.which("node"):
-            self._add_capability("nodejs")
-
-        # Check for virtualization
-        if shutil.which("virtualbox"):
-            self._add_capability("virtualbox")
-        if shutil.which("hyper-v"):
-            self._add_capability("hyper_v")
-
-    def _detect_package_manager(self) -> str:
-        """Detect the primary package manager."""
-        if shutil.which("choco"):
-            return "choco"
-        if shutil.which("winget"):
-            return "winget"
-        if shutil.which("scoop"):
-            return "scoop"
+        # Probes are recorded in table order so the capability list stays stable.
+        # Each is a cached PATH lookup or a single stat, so a thread pool would
+        # cost more than it could overlap.
+        probes = [
+            *((cap, partial(self._has_command, cmd)) for cmd, cap in _PACKAGE_MANAGERS),
+            ("windows_services", Path("C:\\Windows\\System32\\services.exe").exists),
+            ("administrator_access", _is_admin),
+            *((cap, partial(self._has_command, cmd)) for cmd, cap in _TOOLS),
+        ]
+        for capability, probe in probes:
+            if probe():
+                self._add_capability(capability)
+
+    @cached_property
+    def _package_manager(self) -> str:
+        """Primary package manager, detected once per adapter."""
+        for command, _ in _PACKAGE_MANAGERS:
+            if self._has_command(command):
+                return command
         return "unknown"
 
     def _install_with_choco(self, package: str) -> ExecutionResult:
         """Install package with Chocolatey."""
-        command = f"choco install {package} -y"
-        return self.execute_command(command)
+        return self._execute_argv(["choco", "install", package, "-y"])
 
     def _install_with_winget(self, package: str) -> ExecutionResult:
         """Install package with winget."""
-        command = f"winget install {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["winget", "install", package])
 
     def _install_with_scoop(self, package: str) -> ExecutionResult:
         """Install package with Scoop."""
-        command = f"scoop install {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["scoop", "install", package])
 
     def _uninstall_with_choco(self, package: str) -> ExecutionResult:
         """Uninstall package with Chocolatey."""
-        command = f"choco uninstall {package} -y"
-        return self.execute_command(command)
+        return self._execute_argv(["choco", "uninstall", package, "-y"])
 
     def _uninstall_with_winget(self, package: str) -> ExecutionResult:
         """Uninstall package with winget."""
-        command = f"winget uninstall {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["winget", "uninstall", package])
 
     def _uninstall_with_scoop(self, package: str) -> ExecutionResult:
         """Uninstall package with Scoop."""
-        command = f"scoop uninstall {package}"
-        return self.execute_command(command)
+        return self._execute_argv(["scoop", "uninstall", package])
+
+    # Package manager -> method, for install_package and uninstall_package
+    _INSTALLERS: ClassVar[dict[str, Callable[["WindowsAdapter", str], ExecutionResult]]] = {
+        "choco": _install_with_choco,
+        "winget": _install_with_winget,
+        "scoop": _install_with_scoop,
+    }
+    _UNINSTALLERS: ClassVar[dict[str, Callable[["WindowsAdapter", str], ExecutionResult]]] = {
+        "choco": _uninstall_with_choco,
+        "winget": _uninstall_with_winget,
+        "scoop": _uninstall_with_scoop,
+    }
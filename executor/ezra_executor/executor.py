@@ -1,13 +1,50 @@
 """Main executor engine."""
 
+import os
 import time
-from typing import Any
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from .adapters import AndroidAdapter, BaseAdapter, LinuxAdapter, WindowsAdapter
 from .adapters.base import ExecutionResult
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Most actions of one plan running at once; they mostly wait on subprocesses,
+# so this allows more than one per CPU
+_MAX_PARALLEL_ACTIONS = min(32, (os.cpu_count() or 1) + 4)
+
+
+@dataclass(slots=True, frozen=True)
+class _Action:
+    """Typed view of an action dict, read once per action."""
+
+    id: str = "unknown"
+    type: str = "unknown"
+    commands: list[str] = field(default_factory=list)
+    risk_level: str = "medium"
+    package: str = ""
+    file_path: str = ""
+    changes: dict[str, Any] = field(default_factory=dict)
+    source: str = ""
+    destination: str = ""
+    backup_path: str = ""
+    rollback_commands: list[str] | None = None  # None when the action has none
+    dependencies: list[str] | None = None  # None when the action declares none
+
+    @classmethod
+    def from_dict(cls, action: dict[str, Any]) -> "_Action":
+        """Build the view from a raw action dict, ignoring unknown keys."""
+        return cls(**{key: action[key] for key in _ACTION_FIELDS if key in action})
+
+
+_ACTION_FIELDS = _Action.__dataclass_fields__.keys()
+
 
 class ExecutorEngine:
     """Main executor engine for running actions."""
@@ -19,18 +56,30 @@ class ExecutorEngine:
             "windows": WindowsAdapter,
             "android": AndroidAdapter,
         }
-        self._current_adapter: BaseAdapter | None = None
+        # Adapters detect capabilities on construction; keep one per platform
+        self._adapter_instances: dict[str, BaseAdapter] = {}
+        # Action type -> handler; other types run their commands
+        self._handlers: dict[str, Callable[[BaseAdapter, _Action], ExecutionResult]] = {
+            "install": self._execute_install,
+            "configure": self._execute_configure,
+            "modify": self._execute_modify,
+            "backup": self._execute_backup,
+            "restore": self._execute_restore,
+            "jailbreak": self._execute_jailbreak,
+            "bypass": self._execute_bypass,
+        }
 
     def get_adapter(self, platform: str) -> BaseAdapter:
         """Get adapter for the specified platform."""
-        if self._current_adapter is None or self._current_adapter.get_platform() != platform:
+        adapter = self._adapter_instances.get(platform)
+        if adapter is None:
             adapter_class = self.adapters.get(platform)
             if not adapter_class:
                 raise ValueError(f"Unsupported platform: {platform}")
 
-            self._current_adapter = adapter_class()
+            adapter = self._adapter_instances[platform] = adapter_class()
 
-        return self._current_adapter
+        return adapter
 
     def execute_action_plan(self, action_plan: dict[str, Any]) -> list[ExecutionResult]:
         """Execute a complete action plan."""
@@ -40,74 +89,136 @@ class ExecutorEngine:
         logger.info(f"Executing action plan on {platform} with {len(actions)} actions")
 
         adapter = self.get_adapter(platform)
+        actions = [_Action.from_dict(action) for action in actions]
+        if any(action.dependencies is not None for action in actions):
+            return self._execute_action_graph(adapter, actions)
+
         results = []
 
         for action in actions:
-            try:
-                result = self.execute_action(adapter, action)
-                results.append(result)
+            result = self._run_action(adapter, action)
+            results.append(result)
 
-                # If action failed and is critical, stop execution
-                if result.success is False and action.get("risk_level") == "critical":
-                    logger.error(f"Critical action failed, stopping execution: {action.get('id')}")
-                    break
-
-            except Exception as e:
-                logger.error(f"Unexpected error executing action {action.get('id')}: {e}")
-                results.append(ExecutionResult(
-                    success=False,
-                    error=str(e),
-                    duration=0.0,
-                ))
+            # If action failed and is critical, stop execution
+            if self._stops_plan(action, result):
+                break
 
         return results
 
+    def _execute_action_graph(
+        self, adapter: BaseAdapter, actions: list[_Action],
+    ) -> list[ExecutionResult]:
+        """Execute actions once their dependencies finish, independent ones in parallel.
+
+        An action that lists no dependencies, or any action id that is not in
+        the plan, depends on the action before it, as in sequential execution.
+        Results are returned in plan order, one per action; actions left
+        unstarted after a critical failure get a skipped result.
+        """
+        index = {action.id: i for i, action in enumerate(actions)}
+        waiting_on: list[set[int]] = []
+        dependents: defaultdict[int, list[int]] = defaultdict(list)
+        for i, action in enumerate(actions):
+            declared = action.dependencies or []
+            deps = {index[dep] for dep in declared if dep in index}
+            unknown = [dep for dep in declared if dep not in index]
+            for dep in unknown:
+                logger.warning(f"Action {action.id} depends on unknown action {dep}")
+            deps.discard(i)
+            # Without usable dependencies the action keeps its place in the plan
+            if i and (unknown or not deps):
+                deps.add(i - 1)
+            waiting_on.append(deps)
+            for dep in deps:
+                dependents[dep].append(i)
+
+        results: dict[int, ExecutionResult] = {}
+        ready = [i for i, deps in enumerate(waiting_on) if not deps]
+        running: dict[Future[ExecutionResult], int] = {}
+        stopped = False
+
+        with ThreadPoolExecutor(max_workers=_MAX_PARALLEL_ACTIONS) as pool:
+            while ready or running:
+                for i in ready:
+                    running[pool.submit(self._run_action, adapter, actions[i])] = i
+                ready = []
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    results[i] = future.result()
+                    # Let running actions finish, but start nothing new
+                    stopped = stopped or self._stops_plan(actions[i], results[i])
+                    for dependent in dependents[i]:
+                        waiting_on[dependent].discard(i)
+                        if not waiting_on[dependent]:
+                            ready.append(dependent)
+                if stopped:
+                    ready = []
+
+        for i in range(len(actions)):
+            if i in results:
+                continue
+            if stopped:
+                error = "Skipped after a critical action failed"
+            else:
+                # Whatever is left waits on a dependency cycle
+                logger.error(f"Action {actions[i].id} has unresolvable dependencies")
+                error = "Unresolvable action dependencies"
+            results[i] = ExecutionResult(success=False, error=error, duration=0.0)
+
+        return [results[i] for i in range(len(actions))]
+
+    def _run_action(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
+        """Execute an action, turning unexpected errors into a failed result."""
+        try:
+            return self._execute_action(adapter, action)
+        except Exception as e:
+            logger.error(f"Unexpected error executing action {action.id}: {e}")
+            return ExecutionResult(
+                success=False,
+                error=str(e),
+                duration=0.0,
+            )
+
+    @staticmethod
+    def _stops_plan(action: _Action, result: ExecutionResult) -> bool:
+        """Check whether a failed critical action stops the plan."""
+        if result.success is False and action.risk_level == "critical":
+            logger.error(f"Critical action failed, stopping execution: {action.id}")
+            return True
+        return False
+
     def execute_action(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
         """Execute a single action."""
-        action_id = action.get("id", "unknown")
-        action_type = action.get("type", "unknown")
-        commands = action.get("commands", [])
-        risk_level = action.get("risk_level", "medium")
+        return self._execute_action(adapter, _Action.from_dict(action))
 
-        logger.info(f"Executing action {action_id} ({action_type}, {risk_level} risk)")
+    def _execute_action(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
+        """Execute a single action from its parsed view."""
+        logger.info(f"Executing action {action.id} ({action.type}, {action.risk_level} risk)")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             # Create backup if high risk
-            if risk_level in ["high", "critical"]:
-                self._create_backup(adapter, action_id)
-
-            # Execute commands based on action type
-            if action_type == "install":
-                result = self._execute_install(adapter, action)
-            elif action_type == "configure":
-                result = self._execute_configure(adapter, action)
-            elif action_type == "modify":
-                result = self._execute_modify(adapter, action)
-            elif action_type == "backup":
-                result = self._execute_backup(adapter, action)
-            elif action_type == "restore":
-                result = self._execute_restore(adapter, action)
-            elif action_type == "jailbreak":
-                result = self._execute_jailbreak(adapter, action)
-            elif action_type == "bypass":
-                result = self._execute_bypass(adapter, action)
-            else:
-                # Generic command execution
-                result = self._execute_commands(adapter, commands)
+            if action.risk_level in ("high", "critical"):
+                self._create_backup(adapter, action.id)
 
-            duration = time.time() - start_time
+            # Execute commands based on action type, generic commands otherwise
+            handler = self._handlers.get(action.type, self._execute_action_commands)
+            result = handler(adapter, action)
+
+            duration = time.perf_counter() - start_time
             result.duration = duration
 
             return result
 
         except Exception as e:
-            duration = time.time() - start_time
-            logger.error(f"Action {action_id} failed: {e}")
+            duration = time.perf_counter() - start_time
+            logger.error(f"Action {action.id} failed: {e}")
 
             # Attempt rollback if available
-            if "rollback_commands" in action:
+            if action.rollback_commands is not None:
                 self._execute_rollback(adapter, action)
 
             return ExecutionResult(
@@ -116,78 +227,60 @@ class ExecutorEngine:
                 duration=duration,
             )
 
-    def _execute_install(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
+    def _execute_install(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
         """Execute install action."""
-        package = action.get("package", "")
-        if not package:
+        if not action.package:
             return ExecutionResult(success=False, error="No package specified", duration=0.0)
 
-        return adapter.install_package(package)
+        return adapter.install_package(action.package)
 
-    def _execute_configure(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
+    def _execute_configure(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
         """Execute configure action."""
         # Configuration actions are typically file modifications
-        file_path = action.get("file_path", "")
-        changes = action.get("changes", {})
-
-        if file_path and changes:
-            return adapter.modify_file(file_path, changes)
+        if action.file_path and action.changes:
+            return adapter.modify_file(action.file_path, action.changes)
         # Fall back to command execution
-        commands = action.get("commands", [])
-        return self._execute_commands(adapter, commands)
+        return self._execute_action_commands(adapter, action)
 
-    def _execute_modify(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
+    def _execute_modify(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
         """Execute modify action."""
-        file_path = action.get("file_path", "")
-        changes = action.get("changes", {})
+        if action.file_path and action.changes:
+            return adapter.modify_file(action.file_path, action.changes)
+        return self._execute_action_commands(adapter, action)
 
-        if file_path and changes:
-            return adapter.modify_file(file_path, changes)
-        commands = action.get("commands", [])
-        return self._execute_commands(adapter, commands)
-
-    def _execute_backup(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
+    def _execute_backup(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
         """Execute backup action."""
-        source = action.get("source", "")
-        destination = action.get("destination", "")
-
-        if source and destination:
-            return adapter.create_backup(source, destination)
+        if action.source and action.destination:
+            return adapter.create_backup(action.source, action.destination)
         return ExecutionResult(success=False, error="No source or destination specified", duration=0.0)
 
-    def _execute_restore(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
+    def _execute_restore(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
         """Execute restore action."""
-        backup_path = action.get("backup_path", "")
-        destination = action.get("destination", "")
-
-        if backup_path and destination:
-            return adapter.restore_backup(backup_path, destination)
+        if action.backup_path and action.destination:
+            return adapter.restore_backup(action.backup_path, action.destination)
         return ExecutionResult(success=False, error="No backup path or destination specified", duration=0.0)
 
-    def _execute_jailbreak(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
+    def _execute_jailbreak(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
         """Execute jailbreak action (high risk)."""
         logger.warning("Executing jailbreak action - this is high risk!")
-        commands = action.get("commands", [])
-        return self._execute_commands(adapter, commands)
+        return self._execute_action_commands(adapter, action)
 
-    def _execute_bypass(self, adapter: BaseAdapter, action: dict[str, Any]) -> ExecutionResult:
+    def _execute_bypass(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
         """Execute bypass action (high risk)."""
         logger.warning("Executing bypass action - this is high risk!")
-        commands = action.get("commands", [])
-        return self._execute_commands(adapter, commands)
+        return self._execute_action_commands(adapter, action)
+
+    def _execute_action_commands(self, adapter: BaseAdapter, action: _Action) -> ExecutionResult:
+        """Execute an action's commands."""
+        return self._execute_commands(adapter, action.commands)
 
     def _execute_commands(self, adapter: BaseAdapter, commands: list[str]) -> ExecutionResult:
         """Execute a list of commands."""
         if not commands:
             return ExecutionResult(success=False, error="No commands specified", duration=0.0)
 
-        # Execute commands sequentially
-        for command in commands:
-            result = adapter.execute_command(command)
-            if not result.success:
-                return result
-
-        return ExecutionResult(success=True, duration=0.0)
+        # Execute commands sequentially; adapters may batch them into one shell
+        return adapter.execute_sequence(commands)
 
     def _create_backup(self, adapter: BaseAdapter, action_id: str) -> None:
         """Create backup before high-risk operations."""
@@ -195,17 +288,15 @@ class ExecutorEngine:
         logger.info(f"Creating backup for action {action_id}")
         # Implementation would depend on the specific backup strategy
 
-    def _execute_rollback(self, adapter: BaseAdapter, action: dict[str, Any]) -> None:
+    def _execute_rollback(self, adapter: BaseAdapter, action: _Action) -> None:
         """Execute rollback commands."""
-        rollback_commands = action.get("rollback_commands", [])
-
-        if not rollback_commands:
+        if not action.rollback_commands:
             logger.warning("No rollback commands available")
             return
 
-        logger.info(f"Executing rollback for action {action.get('id')}")
+        logger.info(f"Executing rollback for action {action.id}")
 
-        for command in rollback_commands:
+        for command in action.rollback_commands:
             try:
                 result = adapter.execute_command(command)
                 if not result.success:
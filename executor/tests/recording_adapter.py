@@ -0,0 +1,85 @@
+"""Adapter test double that records commands instead of running them."""
+
+import threading
+import time
+from typing import Any
+
+from ezra_executor.adapters.base import BaseAdapter, ExecutionResult, SystemInfo
+
+
+class RecordingAdapter(BaseAdapter):
+    """Adapter that records command start and end order instead of running them.
+
+    A command "fail" fails; "sleep" takes a short while to finish.
+    """
+
+    def __init__(self):
+        """Initialize the event log."""
+        self.events: list[tuple[str, str]] = []
+        self._events_lock = threading.Lock()
+        super().__init__()
+
+    def _record(self, event: str, command: str) -> None:
+        with self._events_lock:
+            self.events.append((event, command))
+
+    def get_platform(self) -> str:
+        """Get the platform name."""
+        return "test"
+
+    def get_system_info(self) -> SystemInfo:
+        """Get system information."""
+        return SystemInfo(platform="test", version="1", architecture="x86_64")
+
+    def execute_command(self, command: str, timeout: int = 300) -> ExecutionResult:
+        """Record the command and pretend to run it."""
+        self._record("start", command)
+        if command.startswith("sleep"):
+            time.sleep(0.2)
+        self._record("end", command)
+        return ExecutionResult(
+            success=not command.startswith("fail"), output=command, duration=0.0,
+        )
+
+    def install_package(self, package: str, **kwargs) -> ExecutionResult:
+        """Install a package."""
+        return self.execute_command(f"install {package}")
+
+    def uninstall_package(self, package: str, **kwargs) -> ExecutionResult:
+        """Uninstall a package."""
+        return self.execute_command(f"uninstall {package}")
+
+    def list_packages(self) -> list[str]:
+        """List installed packages."""
+        return []
+
+    def get_package_info(self, package: str) -> dict[str, Any] | None:
+        """Get information about a package."""
+        return None
+
+    def create_backup(self, source: str, destination: str) -> ExecutionResult:
+        """Create a backup."""
+        return ExecutionResult(success=True, duration=0.0)
+
+    def restore_backup(self, backup_path: str, destination: str) -> ExecutionResult:
+        """Restore from a backup."""
+        return ExecutionResult(success=True, duration=0.0)
+
+    def modify_file(self, file_path: str, changes: dict[str, Any]) -> ExecutionResult:
+        """Modify a file."""
+        return ExecutionResult(success=True, duration=0.0)
+
+    def get_file_info(self, file_path: str) -> dict[str, Any] | None:
+        """Get file information."""
+        return None
+
+    def set_permissions(self, file_path: str, permissions: str) -> ExecutionResult:
+        """Set file permissions."""
+        return ExecutionResult(success=True, duration=0.0)
+
+    def get_permissions(self, file_path: str) -> str | None:
+        """Get file permissions."""
+        return None
+
+    def _detect_capabilities(self) -> None:
+        """Detect system capabilities."""
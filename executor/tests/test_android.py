@@ -0,0 +1,89 @@
+"""Tests for the Android adapter's persistent adb shell."""
+
+import os
+import sys
+
+import pytest
+
+from ezra_executor.adapters.android import AndroidAdapter
+
+# Stands in for adb: `adb shell` runs a local shell, and `adb shell ARGS...`
+# runs the arguments joined with spaces, as adb does on the device
+_FAKE_ADB = """#!/bin/sh
+[ "$1" = shell ] || exit 1
+shift
+[ $# -eq 0 ] && exec sh
+exec sh -c "$*"
+"""
+_EXIT_CODE = 3
+
+
+@pytest.fixture
+def adapter(tmp_path, monkeypatch):
+    """Android adapter talking to the fake adb."""
+    if sys.platform == "win32":
+        pytest.skip("the fake adb is a POSIX shell script")
+    adb = tmp_path / "adb"
+    adb.write_text(_FAKE_ADB)
+    adb.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    adapter = AndroidAdapter()
+    yield adapter
+    adapter._close_adb_shell()
+
+
+def test_quoted_command_is_unquoted_like_the_host_shell(adapter):
+    """A quoted pipeline runs as a pipeline on the device."""
+    result = adapter.execute_command('adb shell "echo foo bar | grep foo"')
+    assert result.success
+    assert result.output == "foo bar\n"
+
+
+def test_arguments_are_joined_with_spaces(adapter):
+    """Separate arguments reach the device shell as one command line."""
+    result = adapter.execute_command("adb shell echo 'a  b' c")
+    assert result.output == "a b c\n"
+
+
+def test_streams_stay_separate(adapter):
+    """stdout is the output, stderr the error, and the exit code is kept."""
+    result = adapter.execute_command(
+        f"adb shell 'echo out; echo err >&2; exit {_EXIT_CODE}'",
+    )
+    assert not result.success
+    assert result.output == "out\n"
+    assert result.error == "err\n"
+    assert result.exit_code == _EXIT_CODE
+
+
+def test_output_without_trailing_newline(adapter):
+    """Output sharing a line with the sentinel is kept."""
+    result = adapter.execute_command("adb shell printf abc")
+    assert result.success
+    assert result.output == "abc"
+
+
+def test_shell_is_reused_across_commands(adapter):
+    """Commands share one adb shell, and state does not leak between them."""
+    adapter.execute_command("adb shell 'cd /; FOO=1'")
+    shell = adapter._adb_shell
+    result = adapter.execute_command("adb shell 'echo $FOO'")
+    assert result.output == "\n"
+    assert adapter._adb_shell is shell
+
+
+def test_timeout_restarts_the_shell(adapter):
+    """A command that times out is abandoned along with its shell."""
+    result = adapter.execute_command("adb shell sleep 5", timeout=1)
+    assert not result.success
+    assert result.error == "Command timed out after 1 seconds"
+
+    result = adapter.execute_command("adb shell echo again")
+    assert result.output == "again\n"
+
+
+def test_unbalanced_quotes_run_on_the_host(adapter):
+    """Commands the host shell cannot parse fail there, as before."""
+    result = adapter.execute_command('adb shell "echo')
+    assert not result.success
+    assert adapter._adb_shell is None
@@ -0,0 +1,136 @@
+"""Tests for the shared adapter helpers."""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from ezra_executor.adapters import base
+from ezra_executor.adapters.base import _STEP_MARKER, BaseAdapter, _after_last_marker
+from ezra_executor.adapters.linux import LinuxAdapter
+
+# Far below the 30 s the killed commands would otherwise run
+_KILL_DEADLINE = 10
+_EXIT_CODE = 4
+
+
+def test_stream_lines_yields_output():
+    """Lines are yielded as the command writes them."""
+    lines = BaseAdapter._stream_lines([sys.executable, "-c", "print('a'); print('b')"])
+    assert list(lines) == ["a\n", "b\n"]
+
+
+def test_stream_lines_raises_on_failure():
+    """A failing command raises once its output is exhausted."""
+    with pytest.raises(subprocess.CalledProcessError):
+        list(BaseAdapter._stream_lines([sys.executable, "-c", "raise SystemExit(3)"]))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell")
+def test_stream_lines_kills_command_at_timeout():
+    """A command is killed at the deadline, along with children holding its output."""
+    start = time.monotonic()
+    lines = []
+    with pytest.raises(subprocess.TimeoutExpired):
+        lines.extend(BaseAdapter._stream_lines("echo first; sleep 30", timeout=1))
+    assert lines == ["first\n"]
+    assert time.monotonic() - start < _KILL_DEADLINE
+
+
+@pytest.fixture
+def linux_adapter():
+    """Linux adapter, whose command sequences run as one batched script."""
+    if sys.platform == "win32":
+        pytest.skip("batched scripts need a POSIX shell")
+    return LinuxAdapter()
+
+
+def test_batched_sequence_succeeds(linux_adapter, tmp_path):
+    """All steps of a successful batch run, in order."""
+    log = tmp_path / "log"
+    result = linux_adapter.execute_sequence(
+        [f"echo one >> {log}", f"echo two >> {log}", f"cd {tmp_path}"],
+    )
+    assert result.success
+    assert log.read_text() == "one\ntwo\n"
+
+
+def test_batched_sequence_reports_failing_step_only(linux_adapter, tmp_path):
+    """A failure stops the batch and reports only that step's output."""
+    log = tmp_path / "log"
+    result = linux_adapter.execute_sequence(
+        [
+            "echo first; echo first-err >&2",
+            f"echo second; echo second-err >&2; exit {_EXIT_CODE}",
+            f"echo third > {log}",
+        ],
+    )
+    assert not result.success
+    assert result.exit_code == _EXIT_CODE
+    assert result.output == "second\n"
+    assert result.error == "second-err\n"
+    assert not log.exists()
+
+
+def test_batched_steps_run_in_subshells(linux_adapter, tmp_path):
+    """Directory and variable changes do not leak into later steps."""
+    result = linux_adapter.execute_sequence(
+        [
+            f"cd {tmp_path}; EZRA_TEST=1",
+            f'[ "$PWD" != "{tmp_path}" ]',
+            '[ -z "$EZRA_TEST" ]',
+        ],
+    )
+    assert result.success
+
+
+def test_batched_timeout_applies_per_step(linux_adapter):
+    """Each step gets the full timeout, and a step that exceeds it is killed."""
+    start = time.monotonic()
+    result = linux_adapter.execute_sequence(["sleep 0.7", "sleep 0.7"], timeout=1)
+    assert result.success
+
+    result = linux_adapter.execute_sequence(
+        ["echo done", "echo partial; sleep 30"], timeout=1,
+    )
+    assert not result.success
+    assert result.error == "Command timed out after 1 seconds"
+    assert result.output == "partial\n"
+    assert time.monotonic() - start < _KILL_DEADLINE
+
+
+def test_batched_failure_with_truncated_marker(linux_adapter, monkeypatch):
+    """When long output pushes the step marker out of the tail, the tail is kept."""
+    monkeypatch.setattr(base, "_MAX_OUTPUT_BYTES", 64)
+    result = linux_adapter.execute_sequence(
+        ["echo early", "printf 'x%.0s' $(seq 200); exit 1"],
+    )
+    assert not result.success
+    assert result.output == "x" * 64
+
+
+@pytest.mark.parametrize(
+    ("output", "expected"),
+    [
+        (f"a\n{_STEP_MARKER}\nb\n{_STEP_MARKER}\nc\n", "c\n"),
+        (f"a\n{_STEP_MARKER}\n", ""),
+        ("tail of a long step\n", "tail of a long step\n"),
+    ],
+)
+def test_after_last_marker(output, expected):
+    """Output is split at the last marker, or kept whole without one."""
+    assert _after_last_marker(output) == expected
+
+
+def test_results_keep_pydantic_style_dumps():
+    """The result dataclasses still offer model_dump() and dict()."""
+    result = base.ExecutionResult(success=False, error="boom", exit_code=_EXIT_CODE, duration=0.5)
+    expected = {
+        "success": False, "output": "", "error": "boom", "exit_code": _EXIT_CODE, "duration": 0.5,
+    }
+    assert result.model_dump() == expected
+    assert result.dict() == expected
+
+    info = base.SystemInfo(platform="linux", version="6", architecture="x86_64")
+    assert info.model_dump()["capabilities"] == []
@@ -0,0 +1,99 @@
+"""Tests for the executor engine."""
+
+from typing import Any
+
+import pytest
+
+from ezra_executor.adapters.base import ExecutionResult
+from ezra_executor.executor import ExecutorEngine
+
+from .recording_adapter import RecordingAdapter
+
+
+@pytest.fixture
+def engine():
+    """Engine whose "test" platform records commands instead of running them."""
+    engine = ExecutorEngine()
+    engine.adapters["test"] = RecordingAdapter
+    return engine
+
+
+def _run(engine: ExecutorEngine, *actions: dict[str, Any]) -> list[ExecutionResult]:
+    return engine.execute_action_plan({"platform": "test", "actions": list(actions)})
+
+
+def _position(adapter: RecordingAdapter, event: str, command: str) -> int:
+    return adapter.events.index((event, command))
+
+
+def test_dependencies_order_actions(engine):
+    """Actions start after their dependencies and independent ones overlap."""
+    results = _run(
+        engine,
+        {"id": "a", "commands": ["sleep a"], "dependencies": []},
+        {"id": "b", "commands": ["sleep b"], "dependencies": ["a"]},
+        {"id": "c", "commands": ["sleep c"], "dependencies": ["a"]},
+        {"id": "d", "commands": ["d"], "dependencies": ["b", "c"]},
+    )
+    adapter = engine.get_adapter("test")
+
+    assert [result.success for result in results] == [True, True, True, True]
+    assert _position(adapter, "end", "sleep a") < _position(adapter, "start", "sleep b")
+    assert _position(adapter, "end", "sleep a") < _position(adapter, "start", "sleep c")
+    # b and c both start before either finishes
+    assert _position(adapter, "start", "sleep c") < _position(adapter, "end", "sleep b")
+    assert _position(adapter, "start", "sleep b") < _position(adapter, "end", "sleep c")
+    assert _position(adapter, "end", "sleep b") < _position(adapter, "start", "d")
+    assert _position(adapter, "end", "sleep c") < _position(adapter, "start", "d")
+
+
+@pytest.mark.parametrize("dependencies", [None, [], ["missing"], ["a", "missing"]])
+def test_unusable_dependencies_keep_plan_order(engine, dependencies):
+    """Missing, empty or unknown dependencies run the action after the previous one."""
+    second: dict[str, Any] = {"id": "b", "commands": ["b"]}
+    if dependencies is not None:
+        second["dependencies"] = dependencies
+    results = _run(
+        engine,
+        {"id": "a", "commands": ["sleep a"], "dependencies": []},
+        second,
+    )
+    adapter = engine.get_adapter("test")
+
+    assert [result.success for result in results] == [True, True]
+    assert _position(adapter, "end", "sleep a") < _position(adapter, "start", "b")
+
+
+def test_dependency_cycle_fails_the_cycle(engine):
+    """Actions waiting on each other fail without running."""
+    results = _run(
+        engine,
+        {"id": "a", "commands": ["a"], "dependencies": []},
+        {"id": "b", "commands": ["b"], "dependencies": ["c"]},
+        {"id": "c", "commands": ["c"], "dependencies": ["b"]},
+    )
+
+    assert results[0].success
+    assert [result.error for result in results[1:]] == [
+        "Unresolvable action dependencies",
+        "Unresolvable action dependencies",
+    ]
+    assert engine.get_adapter("test").events == [("start", "a"), ("end", "a")]
+
+
+def test_critical_failure_skips_remaining_actions(engine):
+    """A failed critical action stops the plan; unstarted actions are skipped."""
+    results = _run(
+        engine,
+        {"id": "a", "commands": ["fail a"], "risk_level": "critical", "dependencies": []},
+        {"id": "b", "commands": ["b"], "dependencies": ["a"]},
+        {"id": "c", "commands": ["c"], "dependencies": ["b"]},
+    )
+
+    assert [result.success for result in results] == [False, False, False]
+    assert results[0].output == "fail a"
+    assert [result.error for result in results[1:]] == [
+        "Skipped after a critical action failed",
+        "Skipped after a critical action failed",
+    ]
+    assert ("start", "b") not in engine.get_adapter("test").events
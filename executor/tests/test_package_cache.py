@@ -0,0 +1,104 @@
+"""Tests for adapter package query caching."""
+
+from typing import Any
+
+import pytest
+
+from ezra_executor.adapters import base
+from ezra_executor.adapters.base import (
+    _PACKAGE_CACHE_TTL,
+    ExecutionResult,
+    _invalidates_packages,
+    _package_cached,
+)
+
+from .recording_adapter import RecordingAdapter
+
+
+class PackageAdapter(RecordingAdapter):
+    """Adapter whose package queries count how often they really run."""
+
+    def __init__(self):
+        """Start with one installed package."""
+        self.packages = ["git"]
+        self.queries = 0
+        super().__init__()
+
+    @_package_cached
+    def list_packages(self) -> list[str]:
+        """List installed packages."""
+        self.queries += 1
+        return self.packages
+
+    @_package_cached
+    def get_package_info(self, package: str, *, verbose: bool = False) -> dict[str, Any] | None:
+        """Get information about a package."""
+        self.queries += 1
+        if package not in self.packages:
+            return None
+        return {"name": package, "verbose": verbose}
+
+    @_invalidates_packages
+    def install_package(self, package: str, **kwargs) -> ExecutionResult:
+        """Install a package."""
+        self.packages = [*self.packages, package]
+        return ExecutionResult(success=True, duration=0.0)
+
+
+@pytest.fixture
+def adapter():
+    """Package adapter with an empty cache."""
+    return PackageAdapter()
+
+
+def test_results_are_reused(adapter):
+    """A repeated query is answered from the cache."""
+    assert adapter.list_packages() == ["git"]
+    assert adapter.list_packages() == ["git"]
+    assert adapter.queries == 1
+
+
+def test_cached_results_are_copies(adapter):
+    """Callers cannot modify the cached result."""
+    adapter.list_packages().append("vim")
+    assert adapter.list_packages() == ["git"]
+
+
+def test_positional_and_keyword_calls_share_entries(adapter):
+    """Arguments are keyed by name, so both call styles hit the same entry."""
+    info = {"name": "git", "verbose": False}
+    assert adapter.get_package_info("git") == info
+    assert adapter.get_package_info(package="git") == info
+    assert adapter.get_package_info("git", verbose=False) == info
+    assert adapter.queries == 1
+
+    assert adapter.get_package_info("git", verbose=True) == {"name": "git", "verbose": True}
+    assert adapter.queries == 1 + 1
+
+
+def test_empty_results_are_not_cached(adapter):
+    """A missing package is looked up again next time."""
+    assert adapter.get_package_info("vim") is None
+    assert adapter.get_package_info("vim") is None
+    assert adapter.queries == 1 + 1
+
+
+def test_package_operations_clear_the_cache(adapter):
+    """Installing through the adapter makes the next query run again."""
+    assert adapter.list_packages() == ["git"]
+    adapter.install_package("vim")
+    assert adapter.list_packages() == ["git", "vim"]
+    assert adapter.queries == 1 + 1
+
+
+def test_results_expire(adapter, monkeypatch):
+    """Changes made outside the adapter show up once the entry expires."""
+    now = 1000.0
+    monkeypatch.setattr(base.time, "monotonic", lambda: now)
+    assert adapter.list_packages() == ["git"]
+
+    adapter.packages = ["git", "vim"]
+    now += _PACKAGE_CACHE_TTL - 1
+    assert adapter.list_packages() == ["git"]
+    now += 1
+    assert adapter.list_packages() == ["git", "vim"]
@@ -0,0 +1,133 @@
+"""Tests for the Windows adapter."""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from ezra_executor.adapters import windows
+from ezra_executor.adapters.base import ExecutionResult
+from ezra_executor.adapters.windows import WindowsAdapter
+
+
+@pytest.mark.skipif(sys.platform != "win32", reason="uses the Win32 security API")
+def test_grant_everyone_full_access(tmp_path):
+    """The ctypes ACL update grants Everyone full control, as icacls would."""
+    path = tmp_path / "file.txt"
+    path.write_text("data")
+
+    windows._grant_everyone_full_access(str(path))
+
+    acl = subprocess.run(
+        ["icacls", str(path)], capture_output=True, text=True, check=True,
+    ).stdout
+    assert "Everyone:(F)" in acl
+
+
+def test_set_permissions_logs_before_icacls_fallback(monkeypatch):
+    """A failed Win32 update is logged and retried through icacls."""
+    def fail(_path):
+        raise OSError(5, "Access is denied")
+
+    calls = []
+
+    def icacls(_self, argv, _timeout=300):
+        calls.append(argv)
+        return ExecutionResult(success=True, duration=0.0)
+
+    monkeypatch.setattr(windows, "_grant_everyone_full_access", fail)
+    monkeypatch.setattr(WindowsAdapter, "_execute_argv", icacls)
+    messages = []
+    sink = logger.add(messages.append, level="WARNING")
+    try:
+        result = WindowsAdapter().set_permissions("C:\\data\\file.txt", "777")
+    finally:
+        logger.remove(sink)
+
+    assert result.success
+    assert calls == [["icacls", "C:\\data\\file.txt", "/grant", "Everyone:F"]]
+    assert any("Access is denied" in message for message in messages)
+
+
+# Stands in for the PowerShell host: each Invoke-EzraCommand line runs its
+# decoded command in a fresh POSIX shell and prints the sentinels like the
+# real runner does
+_FAKE_PWSH = f"""#!{sys.executable}
+import base64, re, subprocess, sys
+
+for line in sys.stdin:
+    match = re.match(r"Invoke-EzraCommand '(.*)'", line)
+    if not match:
+        continue
+    command = base64.b64decode(match.group(1)).decode()
+    result = subprocess.run(["sh", "-c", command], capture_output=True, text=True)
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
+    print("{windows._PS_SENTINEL}", file=sys.stderr, flush=True)
+    print("{windows._PS_SENTINEL}" + str(result.returncode), flush=True)
+"""
+_EXIT_CODE = 3
+
+
+@pytest.fixture
+def host_adapter(tmp_path, monkeypatch):
+    """Windows adapter talking to the fake PowerShell host."""
+    if sys.platform == "win32":
+        pytest.skip("the fake PowerShell host needs a POSIX shell")
+    pwsh = tmp_path / "pwsh"
+    pwsh.write_text(_FAKE_PWSH)
+    pwsh.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    adapter = WindowsAdapter()
+    yield adapter
+    adapter._close_ps_host()
+
+
+def test_host_keeps_streams_separate(host_adapter):
+    """stdout is the output, stderr the error, and the exit code is kept."""
+    result = host_adapter.execute_command(f"echo out; echo err >&2; exit {_EXIT_CODE}")
+    assert not result.success
+    assert result.output == "out\n"
+    assert result.error == "err\n"
+    assert result.exit_code == _EXIT_CODE
+
+
+def test_host_is_reused_across_commands(host_adapter):
+    """Successful commands share one host and report no error."""
+    assert host_adapter.execute_command("echo one").output == "one\n"
+    host = host_adapter._ps_host
+    result = host_adapter.execute_command("echo two; echo warning >&2")
+    assert result.success
+    assert result.output == "two\n"
+    assert result.error is None
+    assert host_adapter._ps_host is host
+
+
+@pytest.mark.skipif(shutil.which("pwsh") is None, reason="needs PowerShell")
+def test_host_commands_are_isolated(tmp_path):
+    """Location, variables and environment changes do not leak between commands."""
+    adapter = WindowsAdapter()
+    try:
+        adapter.execute_command(
+            f"Set-Location '{tmp_path}'; $env:EZRA_TEST = '1'; $global:EzraTest = 1",
+        )
+        result = adapter.execute_command(
+            '(Get-Location).Path; "env=$env:EZRA_TEST"; "var=$global:EzraTest"',
+        )
+        assert result.output.splitlines() == [str(Path.cwd()), "env=", "var="]
+
+        host = adapter._ps_host
+        result = adapter.execute_command(f"'before'; exit {_EXIT_CODE}")
+        assert result.output == "before\n"
+        assert result.exit_code == _EXIT_CODE
+
+        result = adapter.execute_command("throw 'oops'")
+        assert adapter._ps_host is host
+        assert not result.success
+        assert "oops" in result.error
+    finally:
+        adapter._close_ps_host()
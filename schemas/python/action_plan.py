@@ -5,7 +5,9 @@ from enum import Enum
 from typing import Any, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
+
+from .device_manifest import Sha256Hex
 
 
 class StepType(str, Enum):
@@ -38,7 +40,7 @@ class Artifact(BaseModel):
     """Artifact to download or upload"""
 
     url: str
-    sha256: str = Field(..., pattern=r"^[a-f0-9]{64}$")
+    sha256: Sha256Hex
     size: int = Field(..., ge=0)
     destination: Optional[str] = None
 
@@ -94,11 +96,37 @@ class ActionPlanMetadata(BaseModel):
     token_usage: Optional[TokenUsage] = None
 
 
+_PLAN_EXAMPLE = {
+    "plan_id": "550e8400-e29b-41d4-a716-446655440000",
+    "device_manifest_hash": "a" * 64,
+    "generated_by": "gpt-4",
+    "intent": "Install Docker and configure development environment",
+    "created_at": "2025-10-20T12:00:00Z",
+    "steps": [
+        {
+            "id": "step-1",
+            "type": "precheck",
+            "description": "Check system requirements",
+            "command": {"check": "system_resources"},
+            "risk": 0,
+        },
+    ],
+    "rollback": [],
+    "metadata": {
+        "llm_provider": "openai",
+        "model": "gpt-4",
+        "confidence": 0.95,
+    },
+}
+
+
 class ActionPlan(BaseModel):
     """Complete action plan with steps and rollback"""
 
+    model_config = ConfigDict(json_schema_extra={"example": _PLAN_EXAMPLE})
+
     plan_id: UUID
-    device_manifest_hash: str = Field(..., pattern=r"^[a-f0-9]{64}$")
+    device_manifest_hash: Sha256Hex
     generated_by: str
     intent: str
     created_at: datetime
@@ -107,41 +135,3 @@ class ActionPlan(BaseModel):
     rollback: list[RollbackStep]
     metadata: ActionPlanMetadata
     signature: Optional[str] = None
-
-    @field_validator("device_manifest_hash")
-    @classmethod
-    def validate_hash(cls, v: str) -> str:
-        """Validate SHA-256 hash format"""
-        if not v or len(v) != 64:
-            msg = "device_manifest_hash must be a 64-character hex string"
-            raise ValueError(msg)
-        return v.lower()
-
-    class Config:
-        """Pydantic config"""
-
-        json_schema_extra = {
-            "example": {
-                "plan_id": "550e8400-e29b-41d4-a716-446655440000",
-                "device_manifest_hash": "a" * 64,
-                "generated_by": "gpt-4",
-                "intent": "Install Docker and configure development environment",
-                "created_at": "2025-10-20T12:00:00Z",
-                "steps": [
-                    {
-                        "id": "step-1",
-                        "type": "precheck",
-                        "description": "Check system requirements",
-                        "command": {"check": "system_resources"},
-                        "risk": 0,
-                    },
-                ],
-                "rollback": [],
-                "metadata": {
-                    "llm_provider": "openai",
-                    "model": "gpt-4",
-                    "confidence": 0.95,
-                },
-            },
-        }
-
@@ -3,9 +3,11 @@
 from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .device_manifest import Sha256Hex
 
 
 class Actor(str, Enum):
@@ -38,6 +40,8 @@ class AuditEvent(str, Enum):
 class AuditDetails(BaseModel):
     """Event-specific details"""
 
+    model_config = ConfigDict(extra="allow")  # Allow additional fields
+
     command: Optional[str] = None
     output: Optional[str] = None
     error: Optional[str] = None
@@ -48,29 +52,39 @@ class AuditDetails(BaseModel):
     user_id: Optional[str] = None
     reason: Optional[str] = None
 
-    class Config:
-        """Pydantic config"""
-
-        extra = "allow"  # Allow additional fields
-
 
 class AuditMetadata(BaseModel):
     """Additional metadata"""
 
+    model_config = ConfigDict(extra="allow")  # Allow additional fields
+
     hostname: Optional[str] = None
     ip_address: Optional[str] = None
     agent_version: Optional[str] = None
     companion_version: Optional[str] = None
 
-    class Config:
-        """Pydantic config"""
 
-        extra = "allow"  # Allow additional fields
+_ENTRY_EXAMPLE = {
+    "entry_id": "550e8400-e29b-41d4-a716-446655440000",
+    "timestamp": "2025-10-20T12:00:00.123456Z",
+    "actor": "agent",
+    "plan_id": "660e8400-e29b-41d4-a716-446655440000",
+    "step_id": "step-1",
+    "event": "executed",
+    "details": {
+        "command": "apt-get install docker",
+        "exit_code": 0,
+        "duration_ms": 5000,
+    },
+    "device_id": "device-001",
+}
 
 
 class AuditLogEntry(BaseModel):
     """Audit log entry"""
 
+    model_config = ConfigDict(json_schema_extra={"example": _ENTRY_EXAMPLE})
+
     entry_id: UUID
     timestamp: datetime
     actor: Actor
@@ -79,30 +93,10 @@ class AuditLogEntry(BaseModel):
     event: AuditEvent
     details: Optional[AuditDetails] = None
     device_id: Optional[str] = None
-    device_manifest_hash: Optional[str] = Field(None, pattern=r"^[a-f0-9]{64}$")
-    checksum: Optional[str] = Field(None, pattern=r"^[a-f0-9]{64}$")
+    device_manifest_hash: Optional[Sha256Hex] = None
+    checksum: Optional[Sha256Hex] = None
     metadata: Optional[AuditMetadata] = None
 
-    class Config:
-        """Pydantic config"""
-
-        json_schema_extra = {
-            "example": {
-                "entry_id": "550e8400-e29b-41d4-a716-446655440000",
-                "timestamp": "2025-10-20T12:00:00.123456Z",
-                "actor": "agent",
-                "plan_id": "660e8400-e29b-41d4-a716-446655440000",
-                "step_id": "step-1",
-                "event": "executed",
-                "details": {
-                    "command": "apt-get install docker",
-                    "exit_code": 0,
-                    "duration_ms": 5000,
-                },
-                "device_id": "device-001",
-            },
-        }
-
 
 def create_audit_entry(
     actor: Actor,
@@ -116,18 +110,18 @@ def create_audit_entry(
     metadata: Optional[dict[str, Any]] = None,
 ) -> AuditLogEntry:
     """Helper function to create audit log entries"""
-    from uuid import uuid4
-
-    return AuditLogEntry(
-        entry_id=uuid4(),
-        timestamp=datetime.utcnow(),
-        actor=actor,
-        plan_id=plan_id,
-        step_id=step_id,
-        event=event,
-        details=AuditDetails(**details) if details else None,
-        device_id=device_id,
-        device_manifest_hash=device_manifest_hash,
-        metadata=AuditMetadata(**metadata) if metadata else None,
+    # Validate the whole entry, nested models included, in a single pass
+    return AuditLogEntry.model_validate(
+        {
+            "entry_id": uuid4(),
+            "timestamp": datetime.utcnow(),
+            "actor": actor,
+            "plan_id": plan_id,
+            "step_id": step_id,
+            "event": event,
+            "details": details or None,
+            "device_id": device_id,
+            "device_manifest_hash": device_manifest_hash,
+            "metadata": metadata or None,
+        }
     )
-
@@ -2,10 +2,13 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Lowercase hex SHA-256 digest, checked by pydantic-core's compiled regex
+Sha256Hex = Annotated[str, Field(pattern=r"^[a-f0-9]{64}$")]
 
 
 class Platform(str, Enum):
@@ -128,7 +131,7 @@ class Boot(BaseModel):
     secure_boot_enabled: Optional[bool] = None
     boot_loader: Optional[str] = None
     boot_loader_version: Optional[str] = None
-    boot_hash: Optional[str] = Field(None, pattern=r"^[a-f0-9]{64}$")
+    boot_hash: Optional[Sha256Hex] = None
     uefi_mode: Optional[bool] = None
     tpm_present: Optional[bool] = None
     tpm_version: Optional[str] = None
@@ -176,7 +179,7 @@ class FileInfo(BaseModel):
     """File information with integrity hash"""
 
     path: str
-    sha256: str = Field(..., pattern=r"^[a-f0-9]{64}$")
+    sha256: Sha256Hex
     size_bytes: Optional[int] = Field(None, ge=0)
     permissions: Optional[str] = None
     owner: Optional[str] = None
@@ -190,9 +193,42 @@ class Logs(BaseModel):
     journal: Optional[list[str]] = None
 
 
+_MANIFEST_EXAMPLE = {
+    "manifest_id": "550e8400-e29b-41d4-a716-446655440000",
+    "device_id": "device-001",
+    "captured_at": "2025-10-20T12:00:00Z",
+    "hardware": {
+        "cpu": {
+            "model": "Intel Core i7-9700K",
+            "cores": 8,
+            "architecture": "x86_64",
+        },
+        "memory": {"total_bytes": 16777216000},
+    },
+    "storage": {
+        "devices": [
+            {
+                "device": "/dev/sda",
+                "type": "ssd",
+                "size_bytes": 512000000000,
+            },
+        ],
+    },
+    "os": {
+        "platform": "linux",
+        "distribution": "Ubuntu",
+        "kernel": "5.15.0-76-generic",
+        "architecture": "x86_64",
+    },
+    "manifest_hash": "a" * 64,
+}
+
+
 class DeviceManifest(BaseModel):
     """Complete device manifest"""
 
+    model_config = ConfigDict(json_schema_extra={"example": _MANIFEST_EXAMPLE})
+
     manifest_id: UUID
     device_id: str
     captured_at: datetime
@@ -205,40 +241,4 @@ class DeviceManifest(BaseModel):
     files: Optional[list[FileInfo]] = None
     logs: Optional[Logs] = None
     capabilities: Optional[list[str]] = None
-    manifest_hash: str = Field(..., pattern=r"^[a-f0-9]{64}$")
-
-    class Config:
-        """Pydantic config"""
-
-        json_schema_extra = {
-            "example": {
-                "manifest_id": "550e8400-e29b-41d4-a716-446655440000",
-                "device_id": "device-001",
-                "captured_at": "2025-10-20T12:00:00Z",
-                "hardware": {
-                    "cpu": {
-                        "model": "Intel Core i7-9700K",
-                        "cores": 8,
-                        "architecture": "x86_64",
-                    },
-                    "memory": {"total_bytes": 16777216000},
-                },
-                "storage": {
-                    "devices": [
-                        {
-                            "device": "/dev/sda",
-                            "type": "ssd",
-                            "size_bytes": 512000000000,
-                        },
-                    ],
-                },
-                "os": {
-                    "platform": "linux",
-                    "distribution": "Ubuntu",
-                    "kernel": "5.15.0-76-generic",
-                    "architecture": "x86_64",
-                },
-                "manifest_hash": "a" * 64,
-            },
-        }
-
+    manifest_hash: Sha256Hex